@@ -1,25 +1,122 @@
-from collections.abc import AsyncIterator
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import Any, NamedTuple, cast
 from uuid import uuid4
 
 import aiosqlite
 
 DB_PATH = Path(__file__).parent.parent / "eval_studio.db"
 MIGRATIONS_DIR = Path(__file__).parent.parent / "migrations"
+READER_POOL_SIZE = 4
+
+# Per-connection settings. journal_mode is persisted in the database file, so it
+# is set once in init_db rather than on every connect.
+CONNECTION_PRAGMAS = """
+    PRAGMA foreign_keys = ON;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -65536;
+    PRAGMA mmap_size = 268435456;
+    PRAGMA busy_timeout = 5000;
+"""
+
+
+async def configure_connection(db: aiosqlite.Connection) -> None:
+    db.row_factory = aiosqlite.Row
+    await db.executescript(CONNECTION_PRAGMAS)
+
+
+# Long-lived connections, opened by open_connections() from the app lifespan:
+# a pool of readers for GET endpoints, and one writer that every write goes
+# through (see get_writer and writer_connection). When they are not open
+# (tests, scripts) callers fall back to a fresh connection.
+_readers: asyncio.Queue[aiosqlite.Connection] | None = None
+_writer: aiosqlite.Connection | None = None
+_writer_lock: asyncio.Lock | None = None
+
+
+async def _connect(path: Path) -> aiosqlite.Connection:
+    db = await aiosqlite.connect(path)
+    await configure_connection(db)
+    return db
+
+
+async def open_connections(pool_size: int = READER_POOL_SIZE) -> None:
+    global _readers, _writer, _writer_lock
+    _writer = await _connect(DB_PATH)
+    _writer_lock = asyncio.Lock()
+    _readers = asyncio.Queue()
+    for _ in range(pool_size):
+        _readers.put_nowait(await _connect(DB_PATH))
+
+
+async def close_connections() -> None:
+    global _readers, _writer, _writer_lock
+    if _readers is not None:
+        while not _readers.empty():
+            await _readers.get_nowait().close()
+        _readers = None
+    if _writer is not None:
+        await _writer.close()
+        _writer = None
+    _writer_lock = None
+
+
+async def _release(db: aiosqlite.Connection) -> None:
+    if db.in_transaction:
+        await db.rollback()
+
+
+async def get_db() -> AsyncGenerator[aiosqlite.Connection, None]:
+    if _readers is None:
+        async with aiosqlite.connect(DB_PATH) as db:
+            await configure_connection(db)
+            yield db
+        return
+
+    db = await _readers.get()
+    try:
+        yield db
+    finally:
+        await _release(db)
+        _readers.put_nowait(db)
 
 
-async def get_db() -> AsyncIterator[aiosqlite.Connection]:
-    async with aiosqlite.connect(DB_PATH) as db:
-        db.row_factory = aiosqlite.Row
-        await db.execute("PRAGMA foreign_keys = ON")
+async def get_writer() -> AsyncGenerator[aiosqlite.Connection, None]:
+    """Request dependency for endpoints that write; holds the shared writer."""
+    async with writer_connection() as db:
         yield db
 
 
+@asynccontextmanager
+async def writer_connection(
+    db_path: Path | None = None,
+) -> AsyncIterator[aiosqlite.Connection]:
+    """Yield the shared writer connection, one holder at a time.
+
+    A fresh connection is opened instead when the shared one is not open or a
+    different database path is requested.
+    """
+    if _writer is None or _writer_lock is None or (db_path and db_path != DB_PATH):
+        async with aiosqlite.connect(db_path or DB_PATH) as db:
+            await configure_connection(db)
+            yield db
+        return
+
+    async with _writer_lock:
+        try:
+            yield _writer
+        finally:
+            await _release(_writer)
+
+
 async def init_db() -> None:
     async with aiosqlite.connect(DB_PATH) as db:
-        db.row_factory = aiosqlite.Row
-        await db.execute("PRAGMA foreign_keys = ON")
+        await db.execute("PRAGMA journal_mode = WAL")
+        await configure_connection(db)
         await db.execute("""
             CREATE TABLE IF NOT EXISTS schema_migrations (
                 name TEXT PRIMARY KEY,
@@ -47,6 +144,16 @@ async def _apply_migrations(db: aiosqlite.Connection) -> None:
         await db.commit()
 
 
+async def _fetch_tuples(
+    db: aiosqlite.Connection, sql: str, params: Any = ()
+) -> list[tuple[Any, ...]]:
+    """fetchall() with plain tuple rows, for hot listings unpacked positionally."""
+    async with db.execute(sql, params) as cursor:
+        cursor.row_factory = None
+        # With no row factory sqlite3 yields plain tuples; aiosqlite types them as Row.
+        return cast(list[tuple[Any, ...]], list(await cursor.fetchall()))
+
+
 # ---------------------------------------------------------------------------
 # Projects
 # ---------------------------------------------------------------------------
@@ -57,7 +164,7 @@ async def insert_project(
     description: str | None,
     endpoint_url: str | None,
 ) -> str:
-    project_id = str(uuid4())
+    project_id = uuid4().hex
     created_at = datetime.now(UTC).isoformat()
     await db.execute(
         "INSERT INTO projects (id, name, description, endpoint_url, created_at)"
@@ -106,7 +213,7 @@ async def delete_project(db: aiosqlite.Connection, project_id: str) -> None:
 async def insert_suite(
     db: aiosqlite.Connection, project_id: str, name: str
 ) -> str:
-    suite_id = str(uuid4())
+    suite_id = uuid4().hex
     created_at = datetime.now(UTC).isoformat()
     await db.execute(
         "INSERT INTO test_suites (id, project_id, name, created_at) VALUES (?, ?, ?, ?)",
@@ -164,7 +271,7 @@ async def insert_test_case(
     scoring_config: str | None,
     tags: str,
 ) -> str:
-    tc_id = str(uuid4())
+    tc_id = uuid4().hex
     created_at = datetime.now(UTC).isoformat()
     await db.execute(
         """INSERT INTO test_cases
@@ -241,7 +348,7 @@ async def insert_run(
     system_prompt: str,
     pass_threshold: float,
 ) -> str:
-    run_id = str(uuid4())
+    run_id = uuid4().hex
     created_at = datetime.now(UTC).isoformat()
     await db.execute(
         """INSERT INTO runs
@@ -255,9 +362,16 @@ async def insert_run(
     return run_id
 
 
-async def update_run_started(db: aiosqlite.Connection, run_id: str) -> None:
-    await db.execute("UPDATE runs SET status = 'running' WHERE id = ?", (run_id,))
+async def update_run_started(
+    db: aiosqlite.Connection, run_id: str
+) -> aiosqlite.Row | None:
+    """Mark the run as running and return its updated row (None if it doesn't exist)."""
+    async with db.execute(
+        "UPDATE runs SET status = 'running' WHERE id = ? RETURNING *", (run_id,)
+    ) as cursor:
+        rows = list(await cursor.fetchall())
     await db.commit()
+    return rows[0] if rows else None
 
 
 async def update_run_completed(
@@ -295,12 +409,16 @@ async def fetch_run_by_id(
 
 async def fetch_runs_for_project(
     db: aiosqlite.Connection, project_id: str
-) -> list[aiosqlite.Row]:
-    async with db.execute(
-        "SELECT * FROM runs WHERE project_id = ? ORDER BY created_at DESC",
+) -> list[tuple[Any, ...]]:
+    """Tuples of (id, name, status, avg_score, passed, pass_threshold, llm_model,
+    created_at, completed_at), newest first."""
+    return await _fetch_tuples(
+        db,
+        """SELECT id, name, status, avg_score, passed, pass_threshold, llm_model,
+                  created_at, completed_at
+           FROM runs WHERE project_id = ? ORDER BY created_at DESC""",
         (project_id,),
-    ) as cursor:
-        return list(await cursor.fetchall())
+    )
 
 
 async def delete_run(db: aiosqlite.Connection, run_id: str) -> None:
@@ -334,20 +452,86 @@ async def insert_result(
             actual_output, scoring_method, score, passed, latency_ms, reasoning, created_at)
            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
         (
-            str(uuid4()), run_id, test_case_id, input, expected_output, scoring_config,
+            uuid4().hex, run_id, test_case_id, input, expected_output, scoring_config,
             actual_output, scoring_method, score, int(passed), latency_ms, reasoning, created_at,
         ),
     )
 
 
+class ResultRow(NamedTuple):
+    """One result for insert_results."""
+
+    test_case_id: str
+    input: str
+    expected_output: str
+    scoring_config: str | None
+    actual_output: str
+    scoring_method: str
+    score: float
+    passed: bool
+    latency_ms: int
+    reasoning: str | None
+
+
+async def insert_results(
+    db: aiosqlite.Connection, run_id: str, rows: list[ResultRow]
+) -> None:
+    created_at = datetime.now(UTC).isoformat()
+    await db.executemany(
+        """INSERT INTO results
+           (id, run_id, test_case_id, input, expected_output, scoring_config,
+            actual_output, scoring_method, score, passed, latency_ms, reasoning, created_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        [
+            (
+                uuid4().hex, run_id, r.test_case_id, r.input, r.expected_output,
+                r.scoring_config, r.actual_output, r.scoring_method, r.score, int(r.passed),
+                r.latency_ms, r.reasoning, created_at,
+            )
+            for r in rows
+        ],
+    )
+
+
 async def fetch_results_for_run(
-    db: aiosqlite.Connection, run_id: str
-) -> list[aiosqlite.Row]:
+    db: aiosqlite.Connection,
+    run_id: str,
+    limit: int | None = None,
+    after: tuple[str, int] | None = None,
+) -> list[tuple[Any, ...]]:
+    """Results in insertion order, optionally one keyset page at a time.
+
+    Rows are tuples of (created_at, seq, id, test_case_id, input, expected_output,
+    actual_output, scoring_method, score, passed, latency_ms, reasoning). Rows
+    from one run share a created_at, so rowid (exposed as `seq`) breaks ties;
+    `after` is the (created_at, seq) of the last row already seen.
+    """
+    sql = """SELECT created_at, rowid AS seq, id, test_case_id, input, expected_output,
+                    actual_output, scoring_method, score, passed, latency_ms, reasoning
+             FROM results WHERE run_id = ?"""
+    params: list[object] = [run_id]
+    if after is not None:
+        sql += " AND (created_at, rowid) > (?, ?)"
+        params.extend(after)
+    sql += " ORDER BY created_at, rowid"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return await _fetch_tuples(db, sql, params)
+
+
+async def fetch_run_stats(db: aiosqlite.Connection, run_id: str) -> aiosqlite.Row:
     async with db.execute(
-        "SELECT * FROM results WHERE run_id = ? ORDER BY created_at",
+        """SELECT COUNT(*) AS total,
+                  COALESCE(SUM(passed), 0) AS passed,
+                  AVG(score) AS avg_score,
+                  AVG(latency_ms) AS avg_latency_ms
+           FROM results WHERE run_id = ?""",
         (run_id,),
     ) as cursor:
-        return list(await cursor.fetchall())
+        row = await cursor.fetchone()
+        assert row is not None
+        return row
 
 
 async def fetch_results_for_runs(
@@ -4,14 +4,20 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from api.database import init_db
-from api.routes import router
+from api.database import close_connections, init_db, open_connections
+from api.routes import router, start_eval_workers, stop_eval_workers
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     await init_db()
-    yield
+    await open_connections()
+    start_eval_workers()
+    try:
+        yield
+    finally:
+        await stop_eval_workers()
+        await close_connections()
 
 
 app = FastAPI(title="LLM Eval Studio", lifespan=lifespan)
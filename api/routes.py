@@ -1,14 +1,16 @@
+import asyncio
 import json
 import traceback
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Any
 
 import aiosqlite
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, UploadFile
 from fastapi.responses import JSONResponse
 
 from api.database import (
-    DB_PATH,
+    ResultRow,
     count_test_cases_for_suite,
     delete_project,
     delete_run,
@@ -19,14 +21,16 @@ from api.database import (
     fetch_results_for_run,
     fetch_results_for_runs,
     fetch_run_by_id,
+    fetch_run_stats,
     fetch_runs_for_project,
     fetch_suite_by_id,
     fetch_suites_for_project,
     fetch_test_case_by_id,
     fetch_test_cases_for_suite,
     get_db,
+    get_writer,
     insert_project,
-    insert_result,
+    insert_results,
     insert_run,
     insert_suite,
     insert_test_case,
@@ -35,6 +39,7 @@ from api.database import (
     update_run_failed,
     update_run_started,
     update_test_case,
+    writer_connection,
 )
 from api.schemas import (
     GateResponse,
@@ -44,7 +49,6 @@ from api.schemas import (
     ProjectRequest,
     ProjectResponse,
     ResultDelta,
-    ResultResponse,
     RunCompareResponse,
     RunCreatedResponse,
     RunDetailResponse,
@@ -61,11 +65,26 @@ from api.schemas import (
     TestCaseUpdateRequest,
 )
 from eval_runner.models import Run, RunStatus, ScoringMethod, TestCase
-from eval_runner.runner import run_test_case_async
+from eval_runner.runner import gather_bounded_fail_fast, run_test_case
 
 router = APIRouter()
 
 Db = Annotated[aiosqlite.Connection, Depends(get_db)]
+# Endpoints that write take the shared writer so SQLite sees a single writer.
+# scope="function" releases it when the endpoint returns, before background
+# tasks (which take the writer themselves) run.
+Writer = Annotated[aiosqlite.Connection, Depends(get_writer, scope="function")]
+
+
+class OrjsonResponse(JSONResponse):
+    """JSON response rendered by orjson.
+
+    Used by read endpoints that build plain dicts straight from DB rows, skipping
+    per-row Pydantic validation; response_model is kept for the OpenAPI schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
 
 
 # ---------------------------------------------------------------------------
@@ -74,14 +93,8 @@ Db = Annotated[aiosqlite.Connection, Depends(get_db)]
 
 async def _run_eval_background(run_id: str, db_path: Path | None = None) -> None:
     """Execute all test cases for a run and persist results."""
-    _db_path = db_path or DB_PATH
-
-    async with aiosqlite.connect(_db_path) as db:
-        db.row_factory = aiosqlite.Row
-        await db.execute("PRAGMA foreign_keys = ON")
-        await update_run_started(db, run_id)
-
-        run_row = await fetch_run_by_id(db, run_id)
+    async with writer_connection(db_path) as db:
+        run_row = await update_run_started(db, run_id)
         if run_row is None:
             return
 
@@ -101,8 +114,8 @@ async def _run_eval_background(run_id: str, db_path: Path | None = None) -> None
         )
         pass_threshold: float = run_row["pass_threshold"]
 
-        for row in test_case_rows:
-            tc = TestCase(
+        test_cases = [
+            TestCase(
                 id=row["id"],
                 project_id=run_row["project_id"],
                 input=row["input"],
@@ -110,29 +123,38 @@ async def _run_eval_background(run_id: str, db_path: Path | None = None) -> None
                 scoring_method=ScoringMethod(row["scoring_method"]),
                 tags=json.loads(row["tags"]),
             )
-            result = await run_test_case_async(
+            for row in test_case_rows
+        ]
+        # A failed case fails the whole run, so the first error cancels the rest.
+        outcomes = await gather_bounded_fail_fast(
+            run_test_case(
                 tc, run_obj,
                 pass_threshold=pass_threshold,
                 scoring_config=row["scoring_config"],
+                # Stored runs record real model output and latency; repeated
+                # judge verdicts still come from the in-process JUDGE_CACHE.
+                use_cache=False,
             )
-            results.append((tc, row["scoring_config"], result))
+            for tc, row in zip(test_cases, test_case_rows)
+        )
+        results = [
+            (row["id"], tc, row["scoring_config"], outcome)
+            for tc, row, outcome in zip(test_cases, test_case_rows, outcomes)
+        ]
 
     except Exception as exc:
         error_message = traceback.format_exception_only(type(exc), exc)[-1].strip()
 
-    async with aiosqlite.connect(_db_path) as db:
-        db.row_factory = aiosqlite.Row
-        await db.execute("PRAGMA foreign_keys = ON")
-
+    async with writer_connection(db_path) as db:
         if error_message:
             await update_run_failed(db, run_id, error_message)
             return
 
-        for tc, scoring_config, result in results:
-            await insert_result(
-                db,
-                run_id=run_id,
-                test_case_id=str(tc.id),
+        # Results and the final run status land in a single transaction.
+        await db.execute("BEGIN IMMEDIATE")
+        await insert_results(db, run_id, [
+            ResultRow(
+                test_case_id=tc_id,
                 input=tc.input,
                 expected_output=tc.expected_output,
                 scoring_config=scoring_config,
@@ -143,10 +165,11 @@ async def _run_eval_background(run_id: str, db_path: Path | None = None) -> None
                 latency_ms=result.latency_ms,
                 reasoning=result.reasoning or None,
             )
-        await db.commit()
+            for tc_id, tc, scoring_config, result in results
+        ])
 
         if results:
-            scores = [r.score for _, _, r in results]
+            scores = [r.score for *_, r in results]
             avg = sum(scores) / len(scores)
             overall_passed = avg >= pass_threshold
         else:
@@ -156,12 +179,78 @@ async def _run_eval_background(run_id: str, db_path: Path | None = None) -> None
         await update_run_completed(db, run_id, avg_score=avg, passed=overall_passed)
 
 
+EVAL_WORKERS = 4
+EVAL_QUEUE_SIZE = 100
+SHUTDOWN_GRACE_SECONDS = 30.0
+
+# Pending run ids, drained by worker tasks that start_eval_workers() spawns from
+# the app lifespan. When the workers are not running (tests, scripts) create_run
+# falls back to BackgroundTasks.
+_run_queue: asyncio.Queue[str] | None = None
+_workers: list[asyncio.Task[None]] = []
+_in_flight: set[str] = set()
+
+
+def _queue_full() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Run queue is full, retry later",
+        headers={"Retry-After": "5"},
+    )
+
+
+async def _eval_worker(queue: asyncio.Queue[str]) -> None:
+    while True:
+        run_id = await queue.get()
+        _in_flight.add(run_id)
+        try:
+            await _run_eval_background(run_id)
+        except Exception:
+            traceback.print_exc()
+        finally:
+            _in_flight.discard(run_id)
+            queue.task_done()
+
+
+def start_eval_workers(workers: int = EVAL_WORKERS, maxsize: int = EVAL_QUEUE_SIZE) -> None:
+    global _run_queue
+    _run_queue = asyncio.Queue(maxsize=maxsize)
+    _workers.extend(asyncio.create_task(_eval_worker(_run_queue)) for _ in range(workers))
+
+
+async def stop_eval_workers(grace: float = SHUTDOWN_GRACE_SECONDS) -> None:
+    """Give queued and in-flight runs up to `grace` seconds to finish, then cancel
+    the workers and mark every run they did not finish as failed."""
+    global _run_queue
+    queue, _run_queue = _run_queue, None
+    if queue is not None:
+        try:
+            await asyncio.wait_for(queue.join(), grace)
+        except TimeoutError:
+            pass
+
+    # Cancellation skips _run_eval_background's failure handling, so these runs
+    # would otherwise stay 'running' (or 'pending') forever.
+    abandoned = list(_in_flight)
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    while queue is not None and not queue.empty():
+        abandoned.append(queue.get_nowait())
+
+    if abandoned:
+        async with writer_connection() as db:
+            for run_id in abandoned:
+                await update_run_failed(db, run_id, "Server shut down before the run finished")
+
+
 # ---------------------------------------------------------------------------
 # Projects — B-5
 # ---------------------------------------------------------------------------
 
 @router.post("/projects", response_model=ProjectResponse, status_code=201)
-async def create_project(request: ProjectRequest, db: Db) -> ProjectResponse:
+async def create_project(request: ProjectRequest, db: Writer) -> ProjectResponse:
     if not request.name.strip():
         raise HTTPException(status_code=400, detail="name is required")
     project_id = await insert_project(
@@ -218,27 +307,27 @@ async def get_project(project_id: str, db: Db) -> ProjectDetailResponse:
         ],
         recent_runs=[
             RunSummary(
-                id=r["id"],
-                name=r["name"],
-                status=r["status"],
-                avg_score=r["avg_score"],
-                passed=bool(r["passed"]) if r["passed"] is not None else None,
-                created_at=r["created_at"],
+                id=id_,
+                name=name,
+                status=status,
+                avg_score=avg_score,
+                passed=bool(passed) if passed is not None else None,
+                created_at=created_at,
             )
-            for r in run_rows[:10]
+            for id_, name, status, avg_score, passed, _, _, created_at, _ in run_rows[:10]
         ],
         created_at=row["created_at"],
     )
 
 
 @router.delete("/projects/{project_id}", status_code=204)
-async def remove_project(project_id: str, db: Db) -> None:
+async def remove_project(project_id: str, db: Writer) -> None:
     row = await fetch_project_by_id(db, project_id)
     if row is None:
         raise HTTPException(status_code=404, detail="Project not found")
 
     run_rows = await fetch_runs_for_project(db, project_id)
-    if any(r["status"] == "running" for r in run_rows):
+    if any(status == "running" for _, _, status, *_ in run_rows):
         raise HTTPException(status_code=409, detail="Project has runs currently in progress")
 
     await delete_project(db, project_id)
@@ -249,7 +338,7 @@ async def remove_project(project_id: str, db: Db) -> None:
 # ---------------------------------------------------------------------------
 
 @router.post("/projects/{project_id}/suites", response_model=SuiteResponse, status_code=201)
-async def create_suite(project_id: str, request: SuiteRequest, db: Db) -> SuiteResponse:
+async def create_suite(project_id: str, request: SuiteRequest, db: Writer) -> SuiteResponse:
     project = await fetch_project_by_id(db, project_id)
     if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -284,7 +373,7 @@ async def list_suites(project_id: str, db: Db) -> list[SuiteListItem]:
 
 
 @router.delete("/suites/{suite_id}", status_code=204)
-async def remove_suite(suite_id: str, db: Db) -> None:
+async def remove_suite(suite_id: str, db: Writer) -> None:
     suite = await fetch_suite_by_id(db, suite_id)
     if suite is None:
         raise HTTPException(status_code=404, detail="Suite not found")
@@ -314,7 +403,9 @@ def _tc_row_to_response(row: aiosqlite.Row) -> TestCaseResponse:
 
 
 @router.post("/suites/{suite_id}/test-cases", response_model=TestCaseResponse, status_code=201)
-async def create_test_case(suite_id: str, request: TestCaseRequest, db: Db) -> TestCaseResponse:
+async def create_test_case(
+    suite_id: str, request: TestCaseRequest, db: Writer
+) -> TestCaseResponse:
     suite = await fetch_suite_by_id(db, suite_id)
     if suite is None:
         raise HTTPException(status_code=404, detail="Suite not found")
@@ -346,7 +437,7 @@ async def list_test_cases(suite_id: str, db: Db) -> list[TestCaseResponse]:
 
 @router.put("/test-cases/{tc_id}", response_model=TestCaseResponse)
 async def update_test_case_endpoint(
-    tc_id: str, request: TestCaseUpdateRequest, db: Db
+    tc_id: str, request: TestCaseUpdateRequest, db: Writer
 ) -> TestCaseResponse:
     row = await fetch_test_case_by_id(db, tc_id)
     if row is None:
@@ -380,7 +471,7 @@ async def update_test_case_endpoint(
 
 
 @router.delete("/test-cases/{tc_id}", status_code=204)
-async def remove_test_case(tc_id: str, db: Db) -> None:
+async def remove_test_case(tc_id: str, db: Writer) -> None:
     row = await fetch_test_case_by_id(db, tc_id)
     if row is None:
         raise HTTPException(status_code=404, detail="Test case not found")
@@ -388,7 +479,7 @@ async def remove_test_case(tc_id: str, db: Db) -> None:
 
 
 @router.post("/suites/{suite_id}/import", response_model=ImportResponse, status_code=201)
-async def import_test_cases(suite_id: str, file: UploadFile, db: Db) -> ImportResponse:
+async def import_test_cases(suite_id: str, file: UploadFile, db: Writer) -> ImportResponse:
     suite = await fetch_suite_by_id(db, suite_id)
     if suite is None:
         raise HTTPException(status_code=404, detail="Suite not found")
@@ -454,7 +545,7 @@ async def export_test_cases(suite_id: str, db: Db) -> JSONResponse:
 async def create_run(
     request: RunRequest,
     background_tasks: BackgroundTasks,
-    db: Db,
+    db: Writer,
 ) -> RunCreatedResponse:
     if not request.name.strip():
         raise HTTPException(status_code=400, detail="name is required")
@@ -471,6 +562,11 @@ async def create_run(
     if tc_count == 0:
         raise HTTPException(status_code=409, detail="Suite has no test cases")
 
+    # Refuse up front rather than waiting for a slot, which would hold this
+    # request and its pooled connection open indefinitely.
+    if _run_queue is not None and _run_queue.full():
+        raise _queue_full()
+
     run_id = await insert_run(
         db,
         project_id=request.project_id,
@@ -481,9 +577,18 @@ async def create_run(
         pass_threshold=request.pass_threshold,
     )
 
+    if _run_queue is not None:
+        try:
+            _run_queue.put_nowait(run_id)
+        except asyncio.QueueFull:
+            # Filled up while the row was written; don't leave a run that never executes.
+            await delete_run(db, run_id)
+            raise _queue_full() from None
+    else:
+        background_tasks.add_task(_run_eval_background, run_id)
+
     run_row = await fetch_run_by_id(db, run_id)
     assert run_row is not None
-    background_tasks.add_task(_run_eval_background, run_id)
 
     return RunCreatedResponse(
         id=run_id,
@@ -493,70 +598,109 @@ async def create_run(
 
 
 @router.get("/projects/{project_id}/runs", response_model=list[RunListItem])
-async def list_runs(project_id: str, db: Db) -> list[RunListItem]:
+async def list_runs(project_id: str, db: Db) -> OrjsonResponse:
     project = await fetch_project_by_id(db, project_id)
     if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
 
     rows = await fetch_runs_for_project(db, project_id)
-    return [
-        RunListItem(
-            id=r["id"],
-            name=r["name"],
-            status=r["status"],
-            avg_score=r["avg_score"],
-            passed=bool(r["passed"]) if r["passed"] is not None else None,
-            pass_threshold=r["pass_threshold"],
-            llm_model=r["llm_model"],
-            created_at=r["created_at"],
-            completed_at=r["completed_at"],
-        )
-        for r in rows
-    ]
+    return OrjsonResponse([
+        {
+            "id": id_,
+            "name": name,
+            "status": status,
+            "avg_score": avg_score,
+            "passed": bool(passed) if passed is not None else None,
+            "pass_threshold": pass_threshold,
+            "llm_model": llm_model,
+            "created_at": created_at,
+            "completed_at": completed_at,
+        }
+        for (
+            id_, name, status, avg_score, passed, pass_threshold, llm_model,
+            created_at, completed_at,
+        ) in rows
+    ])
+
+
+def _encode_cursor(created_at: str, seq: int) -> str:
+    return f"{created_at}|{seq}"
+
+
+def _decode_cursor(cursor: str) -> tuple[str, int]:
+    created_at, sep, seq = cursor.rpartition("|")
+    if not sep or not seq.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return created_at, int(seq)
 
 
 @router.get("/runs/{run_id}", response_model=RunDetailResponse)
-async def get_run(run_id: str, db: Db) -> RunDetailResponse:
+async def get_run(
+    run_id: str,
+    db: Db,
+    summary_only: bool = False,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+    cursor: str | None = None,
+) -> OrjsonResponse:
     run = await fetch_run_by_id(db, run_id)
     if run is None:
         raise HTTPException(status_code=404, detail="Run not found")
 
-    result_rows = await fetch_results_for_run(db, run_id)
-
-    return RunDetailResponse(
-        id=run["id"],
-        name=run["name"],
-        project_id=run["project_id"],
-        suite_id=run["suite_id"],
-        llm_model=run["llm_model"],
-        system_prompt=run["system_prompt"],
-        pass_threshold=run["pass_threshold"],
-        status=run["status"],
-        error_message=run["error_message"],
-        avg_score=run["avg_score"],
-        passed=bool(run["passed"]) if run["passed"] is not None else None,
-        created_at=run["created_at"],
-        completed_at=run["completed_at"],
-        results=[
-            ResultResponse(
-                id=r["id"],
-                test_case_id=r["test_case_id"],
-                input=r["input"],
-                expected_output=r["expected_output"],
-                actual_output=r["actual_output"],
-                scoring_method=r["scoring_method"],
-                score=r["score"],
-                passed=bool(r["passed"]),
-                latency_ms=r["latency_ms"],
-                reasoning=r["reasoning"],
-            )
-            for r in result_rows
-        ],
+    after = _decode_cursor(cursor) if cursor else None
+    stats = await fetch_run_stats(db, run_id)
+    result_rows = [] if summary_only else await fetch_results_for_run(
+        db, run_id, limit=limit + 1, after=after
     )
+    next_cursor: str | None = None
+    if len(result_rows) > limit:
+        result_rows = result_rows[:limit]
+        created_at, seq, *_ = result_rows[-1]
+        next_cursor = _encode_cursor(created_at, seq)
+
+    return OrjsonResponse({
+        "id": run["id"],
+        "name": run["name"],
+        "project_id": run["project_id"],
+        "suite_id": run["suite_id"],
+        "llm_model": run["llm_model"],
+        "system_prompt": run["system_prompt"],
+        "pass_threshold": run["pass_threshold"],
+        "status": run["status"],
+        "error_message": run["error_message"],
+        "avg_score": run["avg_score"],
+        "passed": bool(run["passed"]) if run["passed"] is not None else None,
+        "created_at": run["created_at"],
+        "completed_at": run["completed_at"],
+        "stats": {
+            "total": stats["total"],
+            "passed": stats["passed"],
+            "avg_score": stats["avg_score"],
+            "avg_latency_ms": stats["avg_latency_ms"],
+        },
+        "results": [
+            {
+                "id": id_,
+                "test_case_id": test_case_id,
+                "input": input_,
+                "expected_output": expected_output,
+                "actual_output": actual_output,
+                "scoring_method": scoring_method,
+                "score": score,
+                "passed": bool(passed),
+                "latency_ms": latency_ms,
+                "reasoning": reasoning,
+            }
+            for (
+                _, _, id_, test_case_id, input_, expected_output, actual_output,
+                scoring_method, score, passed, latency_ms, reasoning,
+            ) in result_rows
+        ],
+        "next_cursor": next_cursor,
+    })
 
 
 @router.delete("/runs/{run_id}", status_code=204)
-async def remove_run(run_id: str, db: Db) -> None:
+async def remove_run(run_id: str, db: Writer) -> None:
     run = await fetch_run_by_id(db, run_id)
     if run is None:
         raise HTTPException(status_code=404, detail="Run not found")
@@ -165,6 +165,13 @@ class ResultResponse(BaseModel):
     reasoning: str | None
 
 
+class RunStats(BaseModel):
+    total: int
+    passed: int
+    avg_score: float | None
+    avg_latency_ms: float | None
+
+
 class RunDetailResponse(BaseModel):
     id: str
     name: str
@@ -179,7 +186,9 @@ class RunDetailResponse(BaseModel):
     passed: bool | None
     created_at: str
     completed_at: str | None
+    stats: RunStats
     results: list[ResultResponse]
+    next_cursor: str | None
 
 
 class RunListItem(BaseModel):
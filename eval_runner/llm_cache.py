@@ -0,0 +1,38 @@
+"""On-disk cache of Claude responses, keyed by a SHA-256 of the request."""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+CACHE_DIR = Path(__file__).parent / "llm_cache"
+
+
+def make_key(model: str, system: Any, prompt: str, max_tokens: int) -> str:
+    payload = {"m": model, "s": system, "p": prompt, "mt": max_tokens}
+    return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def get(key: str) -> str | None:
+    try:
+        data = orjson.loads((CACHE_DIR / f"{key}.json").read_bytes())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return None
+    text: str = data["text"]
+    return text
+
+
+def set(key: str, value: str) -> None:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Write to a temp file and rename, so readers never see a partial entry.
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps({"text": value}))
+        os.replace(tmp, CACHE_DIR / f"{key}.json")
+    except BaseException:
+        os.unlink(tmp)
+        raise
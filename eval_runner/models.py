@@ -23,7 +23,7 @@ class RunStatus(StrEnum):
 
 
 class Project(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     id: UUID = Field(default_factory=uuid4)
     name: str
@@ -56,7 +56,8 @@ class Run(BaseModel):
 
 
 class Result(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    # Results are write-once records; freezing also makes them hashable.
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     id: UUID = Field(default_factory=uuid4)
     run_id: UUID
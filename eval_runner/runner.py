@@ -1,80 +1,185 @@
+import argparse
 import asyncio
-import json
+import functools
+import os
 import time
+from collections.abc import Awaitable, Iterable
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import Any
 from uuid import UUID, uuid4
 
 import anthropic
-from anthropic.types import TextBlock
+import orjson
 from dotenv import load_dotenv
+from pydantic import BaseModel, TypeAdapter
 
+from eval_runner import llm_cache
 from eval_runner.models import Result, Run, RunStatus, TestCase
-from eval_runner.scorers import get_scorer
+from eval_runner.scorers import SystemPrompt, cached_system, get_scorer
 
 MODEL = "claude-sonnet-4-6"
 PASS_THRESHOLD = 0.7
 RESULTS_DIR = Path(__file__).parent / "results"
 TEST_CASES_DIR = Path(__file__).parent / "test_cases"
+MAX_CONCURRENCY = int(os.getenv("EVAL_CONCURRENCY", "8"))
+if MAX_CONCURRENCY < 1:
+    raise ValueError(f"EVAL_CONCURRENCY must be at least 1, got {MAX_CONCURRENCY}")
+STDOUT_SUMMARY = os.getenv("EVAL_STDOUT_SUMMARY", "1") != "0"
+# Built from the SDK's own Limits class, which comes from httpx or httpx2 depending
+# on the installed anthropic version.
+HTTP_LIMITS = type(anthropic.DEFAULT_CONNECTION_LIMITS)(
+    max_connections=32, max_keepalive_connections=32
+)
 
-_client: anthropic.Anthropic | None = None
+_client: anthropic.AsyncAnthropic | None = None
+_TC_LIST_ADAPTER = TypeAdapter(list[TestCase])
 
 
-def get_client() -> anthropic.Anthropic:
+@functools.cache
+def _load_env() -> None:
+    load_dotenv()
+
+
+def get_client() -> anthropic.AsyncAnthropic:
     global _client
     if _client is None:
-        load_dotenv()
-        _client = anthropic.Anthropic()
+        _load_env()
+        # One pooled HTTP/2 transport for all calls, so concurrent requests are
+        # multiplexed over already-open TLS sessions.
+        _client = anthropic.AsyncAnthropic(
+            http_client=anthropic.DefaultAsyncHttpxClient(http2=True, limits=HTTP_LIMITS)
+        )
     return _client
 
 
 def load_test_cases(path: Path, project_id: UUID) -> list[TestCase]:
-    with open(path) as f:
-        raw = json.load(f)
+    raw = orjson.loads(path.read_bytes())
     if not isinstance(raw, list):
         raise ValueError(f"Expected a JSON array, got {type(raw).__name__}")
-    return [TestCase(project_id=project_id, **tc) for tc in raw]
+    for tc in raw:
+        tc["project_id"] = project_id
+    # One validator pass over the whole list instead of a TestCase() call per row.
+    return _TC_LIST_ADAPTER.validate_python(raw)
+
+
+async def call_claude(
+    prompt: str,
+    system_prompt: SystemPrompt = "",
+    max_tokens: int = 1024,
+    use_cache: bool = True,
+) -> tuple[str, int]:
+    """Send one user turn to Claude; returns (text, latency_ms).
+
+    With `use_cache`, identical requests are answered from the on-disk
+    llm_cache with a latency of 0.
+    """
+    start = time.perf_counter_ns()
+
+    # A run's system prompt is the same for every test case, so mark it as a
+    # cache breakpoint. Block lists are passed through as given.
+    if isinstance(system_prompt, str) and system_prompt:
+        system_prompt = cached_system(system_prompt)
+
+    # Cache file I/O runs in a worker thread so it does not stall the event loop.
+    key = llm_cache.make_key(MODEL, system_prompt, prompt, max_tokens) if use_cache else None
+    if key is not None and (cached := await asyncio.to_thread(llm_cache.get, key)) is not None:
+        return cached, 0
 
-
-def call_claude(prompt: str, system_prompt: str = "", max_tokens: int = 1024) -> tuple[str, int]:
-    start = time.monotonic()
     client = get_client()
 
     if system_prompt:
-        response = client.messages.create(
+        response = await client.messages.create(
             model=MODEL,
             max_tokens=max_tokens,
             messages=[{"role": "user", "content": prompt}],
             system=system_prompt,
         )
     else:
-        response = client.messages.create(
+        response = await client.messages.create(
             model=MODEL,
             max_tokens=max_tokens,
             messages=[{"role": "user", "content": prompt}],
         )
 
-    latency_ms = int((time.monotonic() - start) * 1000)
+    latency_ms = (time.perf_counter_ns() - start) // 1_000_000
 
     if not response.content:
         raise ValueError("API returned empty content list")
     block = response.content[0]
-    if not isinstance(block, TextBlock):
-        raise ValueError(f"Unexpected content block type: {type(block)}")
+    if block.type != "text":
+        raise ValueError(f"Unexpected content block type: {block.type!r}")
+    if key is not None:
+        await asyncio.to_thread(llm_cache.set, key, block.text)
     return block.text, latency_ms
 
 
-async def run_test_case_async(
+def _check_limit(limit: int) -> None:
+    # A zero limit would leave every awaitable waiting forever.
+    if limit < 1:
+        raise ValueError(f"Concurrency limit must be at least 1, got {limit}")
+
+
+async def gather_bounded[T](
+    aws: Iterable[Awaitable[T]], limit: int = MAX_CONCURRENCY
+) -> list[T | BaseException]:
+    """Await all of `aws` with at most `limit` in flight; results keep input order."""
+    _check_limit(limit)
+    sem = asyncio.Semaphore(limit)
+
+    async def _guarded(aw: Awaitable[T]) -> T:
+        async with sem:
+            return await aw
+
+    return await asyncio.gather(*(_guarded(aw) for aw in aws), return_exceptions=True)
+
+
+async def gather_bounded_fail_fast[T](
+    aws: Iterable[Awaitable[T]], limit: int = MAX_CONCURRENCY
+) -> list[T]:
+    """Like gather_bounded, but the first exception cancels the rest and is raised.
+
+    `limit` workers pull from `aws` in turn, so items of a lazy iterable that are
+    never reached are never created.
+    """
+    _check_limit(limit)
+    pending = enumerate(aws)
+    results: dict[int, T] = {}
+
+    async def _worker() -> None:
+        for i, aw in pending:
+            results[i] = await aw
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(limit):
+                tg.create_task(_worker())
+    except ExceptionGroup as eg:
+        raise eg.exceptions[0] from None
+    return [results[i] for i in range(len(results))]
+
+
+async def run_test_case(
     test_case: TestCase,
     run: Run,
     pass_threshold: float = PASS_THRESHOLD,
     scoring_config: str | None = None,
+    use_cache: bool = True,
+    cache_judge: bool = True,
 ) -> Result:
-    actual_output, latency_ms = await asyncio.to_thread(
-        call_claude, test_case.input, run.system_prompt
+    """Generate and score one test case.
+
+    `use_cache` controls the on-disk llm_cache for both Claude calls;
+    `cache_judge` controls the in-process JUDGE_CACHE of judge replies.
+    """
+    actual_output, latency_ms = await call_claude(
+        test_case.input, run.system_prompt, use_cache=use_cache
     )
 
-    scorer = get_scorer(test_case.scoring_method, call_claude_fn=call_claude)
+    judge_fn = call_claude if use_cache else functools.partial(call_claude, use_cache=False)
+    scorer = get_scorer(
+        test_case.scoring_method, call_claude_fn=judge_fn, cache_judge=cache_judge
+    )
     scored = await scorer.score(
         input=test_case.input,
         expected=test_case.expected_output,
@@ -93,46 +198,23 @@ async def run_test_case_async(
     )
 
 
-def run_test_case(test_case: TestCase, run: Run) -> Result:
-    """Synchronous wrapper used by the legacy run_eval path."""
-    actual_output, latency_ms = call_claude(test_case.input, run.system_prompt)
-
-    scorer = get_scorer(test_case.scoring_method, call_claude_fn=call_claude)
-    scored = asyncio.run(
-        scorer.score(
-            input=test_case.input,
-            expected=test_case.expected_output,
-            actual=actual_output,
-            pass_threshold=PASS_THRESHOLD,
-        )
-    )
-
-    return Result(
-        run_id=run.id,
-        test_case_id=test_case.id,
-        actual_output=actual_output,
-        score=scored.score,
-        reasoning=scored.reasoning or "",
-        latency_ms=latency_ms,
-    )
-
-
 def print_summary(results: list[Result], test_cases: list[TestCase]) -> None:
     total = len(results)
     passed = sum(1 for r in results if r.score >= PASS_THRESHOLD)
     avg_score = sum(r.score for r in results) / total if total else 0
     avg_latency = sum(r.latency_ms for r in results) / total if total else 0
 
-    tc_map = {tc.id: tc for tc in test_cases}
+    # Results can be a subset of test_cases (failed cases are dropped), so match
+    # by id rather than position.
+    previews = {tc.id: tc.input[:55] for tc in test_cases}
 
     print("\n" + "=" * 55)
     print(f"  EVAL RESULTS — {datetime.now(UTC).strftime('%Y-%m-%d %H:%M:%S')} UTC")
     print("=" * 55)
 
     for result in results:
-        tc = tc_map.get(result.test_case_id)
         status = "✓ PASS" if result.score >= PASS_THRESHOLD else "✗ FAIL"
-        input_preview = tc.input[:55] if tc else "unknown"
+        input_preview = previews.get(result.test_case_id, "unknown")
         print(f"\n{status}  [{result.score:.2f}]  {input_preview}...")
         print(f"         {result.reasoning}")
 
@@ -143,28 +225,52 @@ def print_summary(results: list[Result], test_cases: list[TestCase]) -> None:
     print("=" * 55 + "\n")
 
 
+def _dump_model(obj: object) -> dict[str, Any]:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
 def save_results(results: list[Result], run: Run) -> None:
     RESULTS_DIR.mkdir(exist_ok=True)
     filename = f"{run.name.replace(' ', '_')}_{run.id}.json"
     output_path = RESULTS_DIR / filename
 
-    output = {
-        "run": run.model_dump(mode="json"),
-        "results": [r.model_dump(mode="json") for r in results],
-    }
-
-    with open(output_path, "w") as f:
-        json.dump(output, f, indent=2)
+    # Models are dumped lazily by orjson as it reaches them; it encodes the
+    # UUID/datetime/enum fields natively, so no JSON-mode dump is needed.
+    output = orjson.dumps(
+        {"run": run, "results": results},
+        default=_dump_model,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE,
+    )
+    output_path.write_bytes(output)
 
     print(f"  Results saved → {output_path}\n")
 
 
-def run_eval(test_cases_path: Path, run_name: str, system_prompt: str = "") -> list[Result]:
-    project_id = uuid4()
-    test_cases = load_test_cases(test_cases_path, project_id)
+async def run_eval(
+    test_cases_path: Path,
+    run_name: str,
+    system_prompt: str = "",
+    max_concurrency: int = MAX_CONCURRENCY,
+    use_cache: bool = True,
+) -> list[Result]:
+    test_cases = load_test_cases(test_cases_path, uuid4())
+    return await run_eval_cases(
+        test_cases, run_name, system_prompt, max_concurrency, use_cache
+    )
+
 
+async def run_eval_cases(
+    test_cases: list[TestCase],
+    run_name: str,
+    system_prompt: str = "",
+    max_concurrency: int = MAX_CONCURRENCY,
+    use_cache: bool = True,
+) -> list[Result]:
+    """Like run_eval, for test cases already in memory."""
     run = Run(
-        project_id=project_id,
+        project_id=test_cases[0].project_id if test_cases else uuid4(),
         name=run_name,
         llm_model=MODEL,
         system_prompt=system_prompt,
@@ -173,25 +279,36 @@ def run_eval(test_cases_path: Path, run_name: str, system_prompt: str = "") -> l
 
     print(f"\nStarting run: '{run.name}'  ({len(test_cases)} test cases)")
 
-    results: list[Result] = []
-    errors: list[str] = []
-    for i, tc in enumerate(test_cases, 1):
+    outcomes = await gather_bounded(
+        (run_test_case(tc, run, use_cache=use_cache) for tc in test_cases),
+        limit=max_concurrency,
+    )
+
+    for i, (tc, outcome) in enumerate(zip(test_cases, outcomes), 1):
         print(f"  [{i}/{len(test_cases)}] {tc.input[:55]}...")
-        try:
-            result = run_test_case(tc, run)
-            results.append(result)
-        except Exception as e:
-            errors.append(str(e))
-            print(f"  ERROR on test case {i} ({type(e).__name__}): {e}")
-
-    run.status = RunStatus.failed if errors else RunStatus.completed
-    print_summary(results, test_cases)
-    save_results(results, run)
+        if isinstance(outcome, BaseException):
+            print(f"  ERROR on test case {i} ({type(outcome).__name__}): {outcome}")
+
+    results = [o for o in outcomes if not isinstance(o, BaseException)]
+    run.status = RunStatus.failed if len(results) < len(outcomes) else RunStatus.completed
+    if STDOUT_SUMMARY:
+        print_summary(results, test_cases)
+    # File I/O and serialization run in a worker thread so other runs sharing
+    # the event loop are not stalled.
+    await asyncio.to_thread(save_results, results, run)
     return results
 
 
 if __name__ == "__main__":  # pragma: no cover
-    run_eval(
-        test_cases_path=TEST_CASES_DIR / "sample.json",
-        run_name="sample-run-v1",
+    parser = argparse.ArgumentParser(description="Run the sample eval suite.")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="always call the API, ignoring llm_cache"
+    )
+    args = parser.parse_args()
+    asyncio.run(
+        run_eval(
+            test_cases_path=TEST_CASES_DIR / "sample.json",
+            run_name="sample-run-v1",
+            use_cache=not args.no_cache,
+        )
     )
@@ -1,10 +1,61 @@
+import hashlib
 import json
 import re
-from collections.abc import Callable
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from typing import Protocol
 
-CallClaudeFn = Callable[[str], tuple[str, int]]
+from anthropic.types import TextBlockParam
+
+# Either a plain system prompt or a list of Anthropic system content blocks.
+SystemPrompt = str | list[TextBlockParam]
+CallClaudeFn = Callable[[str, SystemPrompt], Awaitable[tuple[str, int]]]
+
+
+def cached_system(text: str) -> list[TextBlockParam]:
+    """A system prompt marked as a prompt-cache breakpoint."""
+    return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+
+
+# The judge instructions are identical for every call, so they go in a cached
+# system block; only the per-case tags below are sent as the user turn.
+_RUBRIC_SYSTEM = cached_system("""\
+You are evaluating an AI assistant's response against a rubric.
+
+The response is given in <actual> tags and the rubric in <criteria> tags.
+Evaluate the response against ALL of the criteria.
+
+Score how well the response satisfies all criteria:
+- 1.0 = all criteria met
+- 0.5 = some criteria met
+- 0.0 = criteria not met
+
+Respond in this exact format:
+<reasoning>one sentence explanation</reasoning>
+<score>decimal between 0.0 and 1.0</score>""")
+
+_RUBRIC_PROMPT = "<actual>{actual}</actual>\n\n<criteria>\n{criteria_lines}\n</criteria>"
+
+_EXPECTED_SYSTEM = cached_system("""\
+You are evaluating an AI assistant's response against an expected output.
+
+The expected output is given in <expected> tags and the actual response in <actual> tags.
+
+Score how well the actual response satisfies the intent of the expected output.
+- 1.0 = correct and complete
+- 0.5 = partially correct
+- 0.0 = incorrect or irrelevant
+
+Respond in this exact format:
+<reasoning>one sentence explanation</reasoning>
+<score>decimal between 0.0 and 1.0</score>""")
+
+_EXPECTED_PROMPT = "<expected>{expected}</expected>\n<actual>{actual}</actual>"
+
+# Tag case and padding inside the tags vary between judge replies.
+_REASONING_RE = re.compile(r"<reasoning>\s*(.*?)\s*</reasoning>", re.DOTALL | re.IGNORECASE)
+_SCORE_RE = re.compile(r"<score>\s*(.*?)\s*</score>", re.DOTALL | re.IGNORECASE)
 
 
 @dataclass
@@ -25,6 +76,11 @@ class Scorer(Protocol):
     ) -> ScoredResult: ...
 
 
+def normalize_exact(text: str) -> str:
+    """The form ExactMatchScorer compares: trimmed and Unicode case-folded."""
+    return text.strip().casefold()
+
+
 class ExactMatchScorer:
     async def score(
         self,
@@ -34,17 +90,57 @@ class ExactMatchScorer:
         pass_threshold: float,
         scoring_config: str | None = None,
     ) -> ScoredResult:
-        matched = actual.strip().lower() == expected.strip().lower()
+        matched = normalize_exact(actual) == normalize_exact(expected)
         s = 1.0 if matched else 0.0
         reasoning = "Exact match." if matched else f"Expected '{expected}', got '{actual}'."
         return ScoredResult(score=s, passed=s >= pass_threshold, reasoning=reasoning)
 
 
+class JudgeCache:
+    """Bounded LRU of raw judge replies, keyed by a SHA-256 of the judge prompt.
+
+    The prompt embeds the expected output (or rubric) and the actual output, so
+    identical pairs are graded once per process.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self._maxsize = maxsize
+        self._entries: OrderedDict[str, str] = OrderedDict()
+
+    @staticmethod
+    def _key(prompt: str) -> str:
+        return hashlib.sha256(prompt.encode()).hexdigest()
+
+    def get(self, prompt: str) -> str | None:
+        key = self._key(prompt)
+        response = self._entries.get(key)
+        if response is not None:
+            self._entries.move_to_end(key)
+        return response
+
+    def put(self, prompt: str, response: str) -> None:
+        key = self._key(prompt)
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+JUDGE_CACHE = JudgeCache()
+
+
 class LLMJudgeScorer:
     """Calls Claude to score actual output against expected output or a rubric."""
 
-    def __init__(self, call_claude_fn: CallClaudeFn) -> None:
+    def __init__(self, call_claude_fn: CallClaudeFn, cache: JudgeCache | None = None) -> None:
         self._call_claude = call_claude_fn
+        self._cache = cache
 
     async def score(
         self,
@@ -57,46 +153,26 @@ class LLMJudgeScorer:
         if scoring_config:
             config = json.loads(scoring_config)
             criteria_lines = "\n".join(f"- {c}" for c in config.get("criteria", []))
-            prompt = f"""You are evaluating an AI assistant's response against a rubric.
-
-<actual>{actual}</actual>
-
-Evaluate the response against ALL of the following criteria:
-{criteria_lines}
-
-Score how well the response satisfies all criteria:
-- 1.0 = all criteria met
-- 0.5 = some criteria met
-- 0.0 = criteria not met
-
-Respond in this exact format:
-<reasoning>one sentence explanation</reasoning>
-<score>decimal between 0.0 and 1.0</score>"""
+            system = _RUBRIC_SYSTEM
+            prompt = _RUBRIC_PROMPT.format(actual=actual, criteria_lines=criteria_lines)
         else:
-            prompt = f"""You are evaluating an AI assistant's response against an expected output.
-
-<expected>{expected}</expected>
-<actual>{actual}</actual>
-
-Score how well the actual response satisfies the intent of the expected output.
-- 1.0 = correct and complete
-- 0.5 = partially correct
-- 0.0 = incorrect or irrelevant
-
-Respond in this exact format:
-<reasoning>one sentence explanation</reasoning>
-<score>decimal between 0.0 and 1.0</score>"""
+            system = _EXPECTED_SYSTEM
+            prompt = _EXPECTED_PROMPT.format(expected=expected, actual=actual)
 
-        response, _ = self._call_claude(prompt)
+        response = self._cache.get(prompt) if self._cache is not None else None
+        if response is None:
+            response, _ = await self._call_claude(prompt, system)
+            if self._cache is not None:
+                self._cache.put(prompt, response)
 
-        reasoning_match = re.search(r"<reasoning>(.*?)</reasoning>", response, re.DOTALL)
-        score_match = re.search(r"<score>(.*?)</score>", response, re.DOTALL)
+        reasoning_match = _REASONING_RE.search(response)
+        score_match = _SCORE_RE.search(response)
 
         reasoning = (
-            reasoning_match.group(1).strip() if reasoning_match else "Could not parse reasoning."
+            reasoning_match.group(1) if reasoning_match else "Could not parse reasoning."
         )
         try:
-            s = float(score_match.group(1).strip()) if score_match else 0.0
+            s = float(score_match.group(1)) if score_match else 0.0
             s = max(0.0, min(1.0, s))
         except ValueError:
             s = 0.0
@@ -110,11 +186,13 @@ SCORER_REGISTRY: dict[str, type] = {
 }
 
 
-def get_scorer(method: str, call_claude_fn: CallClaudeFn | None = None) -> Scorer:
+def get_scorer(
+    method: str, call_claude_fn: CallClaudeFn | None = None, cache_judge: bool = True
+) -> Scorer:
     if method not in SCORER_REGISTRY:
         raise ValueError(f"Unknown scoring method: {method}")
     if method == "llm_judge":
         if call_claude_fn is None:
             raise ValueError("call_claude_fn is required for llm_judge scorer")
-        return LLMJudgeScorer(call_claude_fn)
+        return LLMJudgeScorer(call_claude_fn, cache=JUDGE_CACHE if cache_judge else None)
     return ExactMatchScorer()
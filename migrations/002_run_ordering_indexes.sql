@@ -0,0 +1,11 @@
+-- 002: Composite indexes for the per-run and per-project listing queries.
+-- results(run_id, created_at) serves fetch_results_for_run's filter + ORDER BY
+-- without a temp sort; runs(project_id, created_at) does the same for
+-- fetch_runs_for_project and the latest-run subqueries in fetch_all_projects.
+-- Both supersede the single-column indexes from 001.
+
+CREATE INDEX IF NOT EXISTS idx_results_run_created ON results(run_id, created_at);
+DROP INDEX IF EXISTS idx_results_run_id;
+
+CREATE INDEX IF NOT EXISTS idx_runs_project_created ON runs(project_id, created_at);
+DROP INDEX IF EXISTS idx_runs_project_id;
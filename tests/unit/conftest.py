@@ -0,0 +1,14 @@
+"""Shared fixtures for unit tests."""
+from collections.abc import Iterator
+
+import pytest
+
+from eval_runner.scorers import JUDGE_CACHE
+
+
+@pytest.fixture(autouse=True)
+def clear_judge_cache() -> Iterator[None]:
+    # JUDGE_CACHE is process-wide; clear it so mocked judge replies don't leak between tests.
+    JUDGE_CACHE.clear()
+    yield
+    JUDGE_CACHE.clear()
@@ -2,6 +2,7 @@
 Integration tests for the Phase 2 API.
 Covers: projects, test suites, test cases, runs, compare, gate, and migration/DB helpers.
 """
+import asyncio
 from collections.abc import AsyncIterator
 from datetime import UTC, datetime
 from pathlib import Path
@@ -13,7 +14,10 @@ import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 
+from api import routes
 from api.database import (
+    ResultRow,
+    close_connections,
     count_test_cases_for_suite,
     delete_project,
     delete_run,
@@ -27,20 +31,24 @@ from api.database import (
     fetch_suites_for_project,
     fetch_test_case_by_id,
     get_db,
+    get_writer,
     init_db,
     insert_project,
     insert_result,
+    insert_results,
     insert_run,
     insert_suite,
     insert_test_case,
+    open_connections,
     suite_has_runs,
     update_run_completed,
     update_run_failed,
     update_run_started,
     update_test_case,
+    writer_connection,
 )
 from api.main import app, lifespan
-from api.routes import _run_eval_background
+from api.routes import _run_eval_background, start_eval_workers, stop_eval_workers
 from eval_runner.models import RunStatus
 
 # ---------------------------------------------------------------------------
@@ -91,6 +99,7 @@ async def client(db: aiosqlite.Connection) -> AsyncIterator[AsyncClient]:
         yield db
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_writer] = override_get_db
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
         yield ac
     app.dependency_overrides.clear()
@@ -132,6 +141,20 @@ async def _seed_run(
     )
 
 
+def _result_row(
+    test_case_id: str,
+    actual_output: str,
+    score: float,
+    latency_ms: int = 100,
+    reasoning: str | None = None,
+) -> ResultRow:
+    return ResultRow(
+        test_case_id=test_case_id, input="Q?", expected_output="A", scoring_config=None,
+        actual_output=actual_output, scoring_method="exact_match", score=score,
+        passed=score >= 0.70, latency_ms=latency_ms, reasoning=reasoning,
+    )
+
+
 # ---------------------------------------------------------------------------
 # DB layer tests
 # ---------------------------------------------------------------------------
@@ -154,6 +177,41 @@ class TestDatabase:
         assert "results" in tables
         assert "schema_migrations" in tables
 
+    async def test_init_db_creates_ordering_indexes(self, tmp_path: Path) -> None:
+        db_path = tmp_path / "test.db"
+        with patch("api.database.DB_PATH", db_path):
+            with patch(
+                "api.database.MIGRATIONS_DIR", Path(__file__).parent.parent.parent / "migrations"
+            ):
+                await init_db()
+        async with aiosqlite.connect(db_path) as conn:
+            async with conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='index'"
+            ) as cursor:
+                indexes = {row[0] for row in await cursor.fetchall()}
+            async with conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM results WHERE run_id = ? ORDER BY created_at",
+                ("x",),
+            ) as cursor:
+                plan = " ".join(row[3] for row in await cursor.fetchall())
+        assert "idx_results_run_created" in indexes
+        assert "idx_runs_project_created" in indexes
+        assert "idx_results_run_id" not in indexes
+        assert "TEMP B-TREE" not in plan
+
+    async def test_init_db_enables_wal(self, tmp_path: Path) -> None:
+        db_path = tmp_path / "test.db"
+        with patch("api.database.DB_PATH", db_path):
+            with patch(
+                "api.database.MIGRATIONS_DIR", Path(__file__).parent.parent.parent / "migrations"
+            ):
+                await init_db()
+        async with aiosqlite.connect(db_path) as conn:
+            async with conn.execute("PRAGMA journal_mode") as cursor:
+                row = await cursor.fetchone()
+        assert row is not None
+        assert row[0] == "wal"
+
     async def test_get_db_yields_connection(self, tmp_path: Path) -> None:
         db_path = tmp_path / "test.db"
         with patch("api.database.DB_PATH", db_path):
@@ -165,6 +223,11 @@ class TestDatabase:
             except StopAsyncIteration:
                 pass
 
+    async def test_generated_ids_are_hex(self, db: aiosqlite.Connection) -> None:
+        pid = await _seed_project(db)
+        assert len(pid) == 32
+        int(pid, 16)
+
     async def test_insert_and_fetch_project(self, db: aiosqlite.Connection) -> None:
         pid = await _seed_project(db)
         row = await fetch_project_by_id(db, pid)
@@ -259,10 +322,16 @@ class TestDatabase:
         pid = await _seed_project(db)
         sid = await _seed_suite(db, pid)
         run_id = await _seed_run(db, pid, sid)
-        await update_run_started(db, run_id)
+        returned = await update_run_started(db, run_id)
         row = await fetch_run_by_id(db, run_id)
         assert row is not None
         assert row["status"] == "running"
+        assert returned is not None
+        assert returned["status"] == "running"
+        assert returned["suite_id"] == sid
+
+    async def test_update_run_started_missing_run(self, db: aiosqlite.Connection) -> None:
+        assert await update_run_started(db, "nonexistent") is None
 
     async def test_update_run_completed(self, db: aiosqlite.Connection) -> None:
         pid = await _seed_project(db)
@@ -306,15 +375,143 @@ class TestDatabase:
         await db.commit()
         rows = await fetch_results_for_run(db, run_id)
         assert len(rows) == 1
-        assert rows[0]["score"] == 1.0
+        *_, score, passed, latency_ms, reasoning = rows[0]
+        assert (score, passed, latency_ms, reasoning) == (1.0, 1, 100, "Exact match.")
+
+    async def test_insert_results_batch(self, db: aiosqlite.Connection) -> None:
+        pid = await _seed_project(db)
+        sid = await _seed_suite(db, pid)
+        tc_id = await _seed_test_case(db, sid)
+        run_id = await _seed_run(db, pid, sid)
+        await insert_results(db, run_id, [
+            _result_row(tc_id, "A", score=1.0, reasoning="Exact match."),
+            _result_row(tc_id, "B", score=0.0, latency_ms=120),
+        ])
+        await db.commit()
+        async with db.execute(
+            "SELECT id, passed FROM results WHERE run_id = ?", (run_id,)
+        ) as cursor:
+            rows = list(await cursor.fetchall())
+        assert len(rows) == 2
+        assert {r["passed"] for r in rows} == {0, 1}
+        assert len({r["id"] for r in rows}) == 2
+
+
+class TestConnectionPool:
+    async def test_get_db_reuses_pooled_connections(self, tmp_path: Path) -> None:
+        with patch("api.database.DB_PATH", tmp_path / "test.db"):
+            await open_connections(pool_size=1)
+            try:
+                gen1 = get_db()
+                conn1 = await gen1.__anext__()
+                await gen1.aclose()
+                gen2 = get_db()
+                conn2 = await gen2.__anext__()
+                await gen2.aclose()
+            finally:
+                await close_connections()
+        assert conn1 is conn2
+
+    async def test_pooled_connection_rolled_back_on_release(self, tmp_path: Path) -> None:
+        with patch("api.database.DB_PATH", tmp_path / "test.db"):
+            await open_connections(pool_size=1)
+            try:
+                gen = get_db()
+                conn = await gen.__anext__()
+                await conn.execute("CREATE TABLE t (x INTEGER)")
+                await conn.execute("INSERT INTO t VALUES (1)")
+                assert conn.in_transaction
+                await gen.aclose()
+                assert not conn.in_transaction
+            finally:
+                await close_connections()
+
+    async def test_writer_connection_is_shared(self, tmp_path: Path) -> None:
+        with patch("api.database.DB_PATH", tmp_path / "test.db"):
+            await open_connections(pool_size=1)
+            try:
+                async with writer_connection() as w1:
+                    pass
+                async with writer_connection() as w2:
+                    pass
+            finally:
+                await close_connections()
+        assert w1 is w2
+
+    async def test_get_writer_holds_the_shared_writer(self, tmp_path: Path) -> None:
+        with patch("api.database.DB_PATH", tmp_path / "test.db"):
+            await open_connections(pool_size=1)
+            try:
+                gen = get_writer()
+                conn = await gen.__anext__()
+
+                async def next_writer() -> aiosqlite.Connection:
+                    async with writer_connection() as w:
+                        return w
+
+                waiter = asyncio.create_task(next_writer())
+                await asyncio.sleep(0)
+                assert not waiter.done()
+                await gen.aclose()
+                assert await waiter is conn
+            finally:
+                await close_connections()
+
+    async def test_write_endpoint_releases_writer_before_background_task(
+        self, tmp_path: Path
+    ) -> None:
+        db_path = tmp_path / "test.db"
+        async with aiosqlite.connect(db_path) as conn:
+            await conn.executescript(SQL_SCHEMA)
+            pid = await _seed_project(conn)
+            sid = await _seed_suite(conn, pid)
+            await _seed_test_case(conn, sid)
+
+        async def fake_background(run_id: str) -> None:
+            async with writer_connection() as db:
+                await update_run_failed(db, run_id, "stub")
+
+        with patch("api.database.DB_PATH", db_path):
+            await open_connections(pool_size=1)
+            try:
+                with patch("api.routes._run_eval_background", fake_background):
+                    async with AsyncClient(
+                        transport=ASGITransport(app=app), base_url="http://test"
+                    ) as ac:
+                        r = await asyncio.wait_for(ac.post("/runs", json={
+                            "name": "R", "project_id": pid, "suite_id": sid,
+                            "system_prompt": "",
+                        }), timeout=5)
+            finally:
+                await close_connections()
+        assert r.status_code == 202
+
+    async def test_writer_connection_opens_fresh_for_other_path(self, tmp_path: Path) -> None:
+        with patch("api.database.DB_PATH", tmp_path / "test.db"):
+            await open_connections(pool_size=1)
+            try:
+                async with writer_connection() as shared:
+                    pass
+                async with writer_connection(tmp_path / "other.db") as other:
+                    assert other is not shared
+            finally:
+                await close_connections()
 
 
 class TestLifespan:
     async def test_lifespan_calls_init_db(self) -> None:
         with patch("api.main.init_db") as mock_init:
-            async with lifespan(app):
-                pass
+            with patch("api.main.open_connections") as mock_open:
+                with patch("api.main.close_connections") as mock_close:
+                    with patch("api.main.start_eval_workers") as mock_start:
+                        with patch("api.main.stop_eval_workers") as mock_stop:
+                            async with lifespan(app):
+                                pass
         mock_init.assert_called_once()
+        mock_open.assert_called_once()
+        mock_close.assert_called_once()
+        mock_start.assert_called_once()
+        mock_stop.assert_called_once()
 
 
 # ---------------------------------------------------------------------------
@@ -328,7 +525,7 @@ class TestBackgroundTask:
             await conn.executescript(SQL_SCHEMA)
             pid = await insert_project(conn, name="P", description=None, endpoint_url=None)
             sid = await insert_suite(conn, project_id=pid, name="S")
-            await insert_test_case(
+            tc_id = await insert_test_case(
                 conn, suite_id=sid, input="Q?", expected_output="A",
                 scoring_method="exact_match", scoring_config=None, tags="[]",
             )
@@ -351,8 +548,13 @@ class TestBackgroundTask:
             conn.row_factory = aiosqlite.Row
             async with conn.execute("SELECT status FROM runs WHERE id = ?", (run_id,)) as cursor:
                 row = await cursor.fetchone()
+            async with conn.execute(
+                "SELECT test_case_id FROM results WHERE run_id = ?", (run_id,)
+            ) as cursor:
+                result_rows = await cursor.fetchall()
         assert row is not None
         assert row["status"] == RunStatus.completed
+        assert [r["test_case_id"] for r in result_rows] == [tc_id]
 
     async def test_marks_run_failed_on_error(self, tmp_path: Path) -> None:
         db_path = tmp_path / "test.db"
@@ -375,10 +577,13 @@ class TestBackgroundTask:
 
         async with aiosqlite.connect(db_path) as conn:
             conn.row_factory = aiosqlite.Row
-            async with conn.execute("SELECT status FROM runs WHERE id = ?", (run_id,)) as cursor:
+            async with conn.execute(
+                "SELECT status, error_message FROM runs WHERE id = ?", (run_id,)
+            ) as cursor:
                 row = await cursor.fetchone()
         assert row is not None
         assert row["status"] == RunStatus.failed
+        assert row["error_message"] == "Exception: API down"
 
 
 # ---------------------------------------------------------------------------
@@ -694,6 +899,132 @@ class TestRuns:
         assert r.status_code == 202
         assert r.json()["status"] == "pending"
 
+    async def test_create_run_enqueues_for_workers(
+        self, client: AsyncClient, db: aiosqlite.Connection
+    ) -> None:
+        pid, sid, _ = await self._setup(client, db)
+        with patch("api.routes._run_eval_background") as mock_bg:
+            start_eval_workers(workers=1)
+            try:
+                r = await client.post("/runs", json={
+                    "name": "Run 1", "project_id": pid, "suite_id": sid,
+                    "system_prompt": "Y",
+                })
+                assert routes._run_queue is not None
+                await routes._run_queue.join()
+            finally:
+                await stop_eval_workers()
+        assert r.status_code == 202
+        mock_bg.assert_awaited_once_with(r.json()["id"])
+
+    async def test_create_run_503_when_queue_full(
+        self, client: AsyncClient, db: aiosqlite.Connection
+    ) -> None:
+        pid, sid, _ = await self._setup(client, db)
+        start_eval_workers(workers=0, maxsize=1)
+        try:
+            assert routes._run_queue is not None
+            routes._run_queue.put_nowait("queued-run")
+            r = await client.post("/runs", json={
+                "name": "Run 1", "project_id": pid, "suite_id": sid, "system_prompt": "Y",
+            })
+            routes._run_queue.get_nowait()
+            routes._run_queue.task_done()
+        finally:
+            await stop_eval_workers()
+        assert r.status_code == 503
+        assert r.headers["retry-after"] == "5"
+        async with db.execute("SELECT COUNT(*) FROM runs") as cursor:
+            row = await cursor.fetchone()
+        assert row is not None
+        assert row[0] == 0
+
+    async def test_create_run_deletes_row_when_queue_fills_during_insert(
+        self, client: AsyncClient, db: aiosqlite.Connection, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        pid, sid, _ = await self._setup(client, db)
+        queue = MagicMock()
+        queue.full.return_value = False
+        queue.put_nowait.side_effect = asyncio.QueueFull
+        monkeypatch.setattr("api.routes._run_queue", queue)
+        r = await client.post("/runs", json={
+            "name": "Run 1", "project_id": pid, "suite_id": sid, "system_prompt": "Y",
+        })
+        assert r.status_code == 503
+        async with db.execute("SELECT COUNT(*) FROM runs") as cursor:
+            row = await cursor.fetchone()
+        assert row is not None
+        assert row[0] == 0
+
+    async def test_eval_worker_survives_failed_run(self) -> None:
+        with patch(
+            "api.routes._run_eval_background", side_effect=[RuntimeError("boom"), None]
+        ) as mock_bg:
+            start_eval_workers(workers=1)
+            try:
+                assert routes._run_queue is not None
+                await routes._run_queue.put("run-1")
+                await routes._run_queue.put("run-2")
+                await routes._run_queue.join()
+            finally:
+                await stop_eval_workers()
+        assert mock_bg.await_count == 2
+        assert routes._run_queue is None
+
+    async def _seed_runs(self, db_path: Path, count: int) -> list[str]:
+        async with aiosqlite.connect(db_path) as conn:
+            await conn.executescript(SQL_SCHEMA)
+            pid = await insert_project(conn, name="P", description=None, endpoint_url=None)
+            sid = await insert_suite(conn, project_id=pid, name="S")
+            return [
+                await insert_run(
+                    conn, project_id=pid, suite_id=sid, name=f"R{i}",
+                    llm_model="claude-sonnet-4-6", system_prompt="", pass_threshold=0.7,
+                )
+                for i in range(count)
+            ]
+
+    async def test_stop_eval_workers_waits_for_in_flight_runs(self, tmp_path: Path) -> None:
+        db_path = tmp_path / "test.db"
+        run_ids = await self._seed_runs(db_path, 2)
+        finished: list[str] = []
+
+        async def slow_run(run_id: str) -> None:
+            await asyncio.sleep(0.01)
+            finished.append(run_id)
+
+        with patch("api.database.DB_PATH", db_path):
+            with patch("api.routes._run_eval_background", side_effect=slow_run):
+                start_eval_workers(workers=1)
+                assert routes._run_queue is not None
+                for run_id in run_ids:
+                    routes._run_queue.put_nowait(run_id)
+                await stop_eval_workers(grace=5)
+        assert finished == run_ids
+
+    async def test_stop_eval_workers_fails_unfinished_runs(self, tmp_path: Path) -> None:
+        db_path = tmp_path / "test.db"
+        in_flight, queued = await self._seed_runs(db_path, 2)
+
+        async def hang(run_id: str) -> None:
+            await asyncio.Event().wait()
+
+        with patch("api.database.DB_PATH", db_path):
+            with patch("api.routes._run_eval_background", side_effect=hang):
+                start_eval_workers(workers=1)
+                assert routes._run_queue is not None
+                routes._run_queue.put_nowait(in_flight)
+                routes._run_queue.put_nowait(queued)
+                await asyncio.sleep(0)
+                assert routes._in_flight == {in_flight}
+                await stop_eval_workers(grace=0.01)
+        async with aiosqlite.connect(db_path) as conn:
+            async with conn.execute("SELECT status, error_message FROM runs") as cursor:
+                rows = await cursor.fetchall()
+        assert [tuple(r) for r in rows] == [
+            ("failed", "Server shut down before the run finished"),
+        ] * 2
+
     async def test_create_run_400_empty_name(
         self, client: AsyncClient, db: aiosqlite.Connection
     ) -> None:
@@ -733,6 +1064,13 @@ class TestRuns:
         assert r.status_code == 200
         assert len(r.json()) == 1
 
+    async def test_run_read_endpoints_keep_openapi_schema(self, client: AsyncClient) -> None:
+        spec = (await client.get("/openapi.json")).json()
+        detail = spec["paths"]["/runs/{run_id}"]["get"]["responses"]["200"]
+        listing = spec["paths"]["/projects/{project_id}/runs"]["get"]["responses"]["200"]
+        assert "RunDetailResponse" in str(detail)
+        assert "RunListItem" in str(listing)
+
     async def test_list_runs_404_bad_project(self, client: AsyncClient) -> None:
         r = await client.get("/projects/bad/runs")
         assert r.status_code == 404
@@ -749,6 +1087,85 @@ class TestRuns:
         assert r.status_code == 200
         assert r.json()["id"] == run_id
 
+    async def test_get_run_includes_stats(
+        self, client: AsyncClient, db: aiosqlite.Connection
+    ) -> None:
+        pid, sid, _ = await self._setup(client, db)
+        with patch("api.routes._run_eval_background"):
+            run_id = (await client.post("/runs", json={
+                "name": "R", "project_id": pid, "suite_id": sid, "system_prompt": "Y",
+            })).json()["id"]
+        tc_id = (await client.get(f"/suites/{sid}/test-cases")).json()[0]["id"]
+        await insert_results(db, run_id, [
+            _result_row(tc_id, "A", score=1.0),
+            _result_row(tc_id, "B", score=0.0, latency_ms=300),
+        ])
+        await db.commit()
+
+        r = await client.get(f"/runs/{run_id}")
+        assert r.json()["stats"] == {
+            "total": 2, "passed": 1, "avg_score": 0.5, "avg_latency_ms": 200.0,
+        }
+        assert len(r.json()["results"]) == 2
+
+        r = await client.get(f"/runs/{run_id}", params={"summary_only": True})
+        assert r.json()["stats"]["total"] == 2
+        assert r.json()["results"] == []
+
+    async def test_get_run_paginates_results(
+        self, client: AsyncClient, db: aiosqlite.Connection
+    ) -> None:
+        pid, sid, _ = await self._setup(client, db)
+        with patch("api.routes._run_eval_background"):
+            run_id = (await client.post("/runs", json={
+                "name": "R", "project_id": pid, "suite_id": sid, "system_prompt": "Y",
+            })).json()["id"]
+        tc_id = (await client.get(f"/suites/{sid}/test-cases")).json()[0]["id"]
+        await insert_results(db, run_id, [
+            _result_row(tc_id, f"out-{i}", score=1.0) for i in range(5)
+        ])
+        await db.commit()
+
+        seen: list[str] = []
+        cursor: str | None = None
+        pages = 0
+        while True:
+            params: dict[str, str | int] = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            body = (await client.get(f"/runs/{run_id}", params=params)).json()
+            seen.extend(r["actual_output"] for r in body["results"])
+            pages += 1
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+        assert pages == 3
+        assert seen == [f"out-{i}" for i in range(5)]
+
+    async def test_get_run_400_bad_cursor(
+        self, client: AsyncClient, db: aiosqlite.Connection
+    ) -> None:
+        pid, sid, _ = await self._setup(client, db)
+        with patch("api.routes._run_eval_background"):
+            run_id = (await client.post("/runs", json={
+                "name": "R", "project_id": pid, "suite_id": sid, "system_prompt": "Y",
+            })).json()["id"]
+        r = await client.get(f"/runs/{run_id}", params={"cursor": "garbage"})
+        assert r.status_code == 400
+
+    async def test_get_run_stats_empty(
+        self, client: AsyncClient, db: aiosqlite.Connection
+    ) -> None:
+        pid, sid, _ = await self._setup(client, db)
+        with patch("api.routes._run_eval_background"):
+            run_id = (await client.post("/runs", json={
+                "name": "R", "project_id": pid, "suite_id": sid, "system_prompt": "Y",
+            })).json()["id"]
+        r = await client.get(f"/runs/{run_id}")
+        assert r.json()["stats"] == {
+            "total": 0, "passed": 0, "avg_score": None, "avg_latency_ms": None,
+        }
+
     async def test_get_run_404(self, client: AsyncClient) -> None:
         r = await client.get("/runs/nonexistent")
         assert r.status_code == 404
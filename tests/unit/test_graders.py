@@ -1,7 +1,16 @@
 """Tests for scorer implementations (previously test_graders.py)."""
+from unittest.mock import AsyncMock
+
 import pytest
 
-from eval_runner.scorers import ExactMatchScorer, LLMJudgeScorer
+from eval_runner.scorers import (
+    JUDGE_CACHE,
+    ExactMatchScorer,
+    JudgeCache,
+    LLMJudgeScorer,
+    SystemPrompt,
+    get_scorer,
+)
 
 
 class TestExactMatchScorer:
@@ -25,6 +34,10 @@ class TestExactMatchScorer:
         r = await self.scorer.score("Q", "Paris", "  Paris  ", pass_threshold=0.7)
         assert r.score == 1.0
 
+    async def test_exact_match_casefolds_unicode(self) -> None:
+        r = await self.scorer.score("Q", "STRASSE", "straße", pass_threshold=0.7)
+        assert r.score == 1.0
+
     async def test_fails_on_verbose_response(self) -> None:
         r = await self.scorer.score(
             "Q", "Paris", "The capital of France is Paris.", pass_threshold=0.7
@@ -52,7 +65,7 @@ class TestExactMatchScorer:
 
 class TestLLMJudgeScorer:
     def _mock_call(self, reasoning: str, score: str):  # type: ignore[no-untyped-def]
-        def call_claude(prompt: str) -> tuple[str, int]:
+        async def call_claude(prompt: str, system: SystemPrompt) -> tuple[str, int]:
             return f"<reasoning>{reasoning}</reasoning>\n<score>{score}</score>", 0
         return call_claude
 
@@ -73,15 +86,22 @@ class TestLLMJudgeScorer:
         assert r.score == 0.0
 
     async def test_missing_score_tag_defaults_to_zero(self) -> None:
-        scorer = LLMJudgeScorer(lambda _: ("<reasoning>Something.</reasoning>", 0))
+        scorer = LLMJudgeScorer(AsyncMock(return_value=("<reasoning>Something.</reasoning>", 0)))
         r = await scorer.score("Q", "a", "b", pass_threshold=0.7)
         assert r.score == 0.0
 
     async def test_missing_reasoning_uses_fallback(self) -> None:
-        scorer = LLMJudgeScorer(lambda _: ("<score>0.8</score>", 0))
+        scorer = LLMJudgeScorer(AsyncMock(return_value=("<score>0.8</score>", 0)))
         r = await scorer.score("Q", "a", "b", pass_threshold=0.7)
         assert r.reasoning == "Could not parse reasoning."
 
+    async def test_parses_tags_case_insensitively_with_padding(self) -> None:
+        reply = "<Reasoning>\n  Close enough.\n</Reasoning>\n<SCORE> 0.6 </SCORE>"
+        scorer = LLMJudgeScorer(AsyncMock(return_value=(reply, 0)))
+        r = await scorer.score("Q", "a", "b", pass_threshold=0.7)
+        assert r.score == pytest.approx(0.6)
+        assert r.reasoning == "Close enough."
+
     async def test_non_numeric_score_defaults_to_zero(self) -> None:
         scorer = LLMJudgeScorer(self._mock_call("Hmm.", "high"))
         r = await scorer.score("Q", "a", "b", pass_threshold=0.7)
@@ -91,7 +111,7 @@ class TestLLMJudgeScorer:
         import json
         received: list[str] = []
 
-        def call_claude(prompt: str) -> tuple[str, int]:
+        async def call_claude(prompt: str, system: SystemPrompt) -> tuple[str, int]:
             received.append(prompt)
             return "<reasoning>Met criteria.</reasoning>\n<score>1.0</score>", 0
 
@@ -106,7 +126,7 @@ class TestLLMJudgeScorer:
     async def test_falls_back_to_expected_without_config(self) -> None:
         received: list[str] = []
 
-        def call_claude(prompt: str) -> tuple[str, int]:
+        async def call_claude(prompt: str, system: SystemPrompt) -> tuple[str, int]:
             received.append(prompt)
             return "<reasoning>Good.</reasoning>\n<score>0.8</score>", 0
 
@@ -122,3 +142,76 @@ class TestLLMJudgeScorer:
         scorer2 = LLMJudgeScorer(self._mock_call("Ok.", "0.75"))
         r2 = await scorer2.score("Q", "a", "b", pass_threshold=0.70)
         assert r2.passed is True
+
+    async def test_braces_in_outputs_are_passed_through(self) -> None:
+        received: list[str] = []
+
+        async def call_claude(prompt: str, system: SystemPrompt) -> tuple[str, int]:
+            received.append(prompt)
+            return "<reasoning>Ok.</reasoning>\n<score>1.0</score>", 0
+
+        scorer = LLMJudgeScorer(call_claude)
+        await scorer.score("Q", '{"a": 1}', "{actual}", pass_threshold=0.7)
+        assert '<expected>{"a": 1}</expected>' in received[0]
+        assert "<actual>{actual}</actual>" in received[0]
+
+    async def test_instructions_sent_as_cached_system_block(self) -> None:
+        systems: list[SystemPrompt] = []
+
+        async def call_claude(prompt: str, system: SystemPrompt) -> tuple[str, int]:
+            systems.append(system)
+            assert "Respond in this exact format" not in prompt
+            return "<reasoning>Ok.</reasoning>\n<score>1.0</score>", 0
+
+        scorer = LLMJudgeScorer(call_claude)
+        await scorer.score("Q", "expected", "actual", pass_threshold=0.7)
+        config = '{"criteria": ["Must mention Paris"]}'
+        await scorer.score("Q", "expected", "Paris", pass_threshold=0.7, scoring_config=config)
+        for system in systems:
+            assert isinstance(system, list)
+            assert system[0]["cache_control"] == {"type": "ephemeral"}
+            assert "Respond in this exact format" in system[0]["text"]
+
+
+class TestJudgeCache:
+    def test_evicts_least_recently_used(self) -> None:
+        cache = JudgeCache(maxsize=2)
+        cache.put("a", "A")
+        cache.put("b", "B")
+        assert cache.get("a") == "A"
+        cache.put("c", "C")
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+        assert cache.get("c") == "C"
+
+    async def test_scorer_reuses_cached_reply(self) -> None:
+        calls: list[str] = []
+
+        async def call_claude(prompt: str, system: SystemPrompt) -> tuple[str, int]:
+            calls.append(prompt)
+            return "<reasoning>Good.</reasoning>\n<score>0.8</score>", 0
+
+        scorer = LLMJudgeScorer(call_claude, cache=JudgeCache())
+        r1 = await scorer.score("Q", "expected", "actual", pass_threshold=0.7)
+        r2 = await scorer.score("Q", "expected", "actual", pass_threshold=0.7)
+        await scorer.score("Q", "expected", "other", pass_threshold=0.7)
+        assert len(calls) == 2
+        assert r1 == r2
+
+    def test_get_scorer_uses_shared_cache(self) -> None:
+        scorer = get_scorer("llm_judge", call_claude_fn=AsyncMock())
+        assert isinstance(scorer, LLMJudgeScorer)
+        assert scorer._cache is JUDGE_CACHE
+
+    def test_get_scorer_without_cache(self) -> None:
+        scorer = get_scorer("llm_judge", call_claude_fn=AsyncMock(), cache_judge=False)
+        assert isinstance(scorer, LLMJudgeScorer)
+        assert scorer._cache is None
+
+    async def test_shared_cache_is_empty_at_test_start(self) -> None:
+        assert len(JUDGE_CACHE) == 0
+        scorer = get_scorer(
+            "llm_judge", call_claude_fn=AsyncMock(return_value=("<score>0.9</score>", 0))
+        )
+        await scorer.score("Q", "expected", "actual", pass_threshold=0.7)
+        assert len(JUDGE_CACHE) == 1
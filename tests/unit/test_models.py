@@ -29,6 +29,11 @@ class TestProject:
         with pytest.raises(ValidationError):
             Project(name="A", unknown_field="x")  # type: ignore[call-arg]
 
+    def test_is_immutable(self) -> None:
+        p = Project(name="A")
+        with pytest.raises(ValidationError):
+            p.created_at = p.created_at
+
 
 class TestTestCase:
     def test_creates_with_required_fields(self) -> None:
@@ -101,6 +106,15 @@ class TestResult:
         with pytest.raises(ValidationError):
             self._valid_result(score=-0.1)
 
+    def test_is_immutable(self) -> None:
+        r = self._valid_result()
+        with pytest.raises(ValidationError):
+            r.score = 0.1
+
+    def test_is_hashable(self) -> None:
+        r = self._valid_result()
+        assert r in {r}
+
     def test_invalid_uuid_raises(self) -> None:
         with pytest.raises(ValidationError):
             Result(
@@ -1,26 +1,38 @@
+import asyncio
 import json
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Any
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 from uuid import uuid4
 
 import pytest
-from anthropic.types import TextBlock
+from anthropic.types import TextBlock, TextBlockParam
 from pydantic import ValidationError
+from pytest_mock import MockerFixture
 
 from eval_runner.models import Result, Run, RunStatus, ScoringMethod, TestCase
 from eval_runner.runner import (
     call_claude,
+    gather_bounded,
+    gather_bounded_fail_fast,
     get_client,
     load_test_cases,
     print_summary,
     run_eval,
+    run_eval_cases,
     run_test_case,
     save_results,
 )
 
 
+@pytest.fixture(autouse=True)
+def isolated_llm_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    cache_dir = tmp_path / "llm_cache"
+    monkeypatch.setattr("eval_runner.llm_cache.CACHE_DIR", cache_dir)
+    return cache_dir
+
+
 def make_anthropic_response(text: str) -> SimpleNamespace:
     return SimpleNamespace(content=[TextBlock(type="text", text=text)])
 
@@ -42,22 +54,71 @@ def make_result(**kwargs: Any) -> Result:
     return Result(**{**defaults, **kwargs})
 
 
+@pytest.fixture
+def mock_claude(mocker: MockerFixture) -> AsyncMock:
+    mock: AsyncMock = mocker.patch("eval_runner.runner.call_claude")
+    return mock
+
+
+# Read-only models shared across tests that only format or serialize them.
+@pytest.fixture(scope="module")
+def shared_run() -> Run:
+    return make_run()
+
+
+@pytest.fixture(scope="module")
+def shared_tc(shared_run: Run) -> TestCase:
+    return TestCase(project_id=shared_run.project_id, input="Question?", expected_output="Answer")
+
+
+@pytest.fixture(scope="module")
+def shared_result(shared_run: Run) -> Result:
+    return make_result(run_id=shared_run.id)
+
+
 class TestGetClient:
+    @pytest.fixture(autouse=True)
+    def reset_env_loader(self) -> None:
+        import eval_runner.runner as runner_mod
+        runner_mod._load_env.cache_clear()
+
     def test_creates_anthropic_client(self) -> None:
         import eval_runner.runner as runner_mod
         runner_mod._client = None
         with patch("eval_runner.runner.load_dotenv") as mock_dotenv:
-            with patch("eval_runner.runner.anthropic.Anthropic") as mock_cls:
+            with patch("eval_runner.runner.anthropic.AsyncAnthropic") as mock_cls:
                 client = get_client()
         assert client is mock_cls.return_value
         mock_dotenv.assert_called_once()
         runner_mod._client = None
 
+    def test_loads_env_only_once(self) -> None:
+        import eval_runner.runner as runner_mod
+        runner_mod._client = None
+        with patch("eval_runner.runner.load_dotenv") as mock_dotenv:
+            with patch("eval_runner.runner.anthropic.AsyncAnthropic"):
+                get_client()
+                runner_mod._client = None
+                get_client()
+        mock_dotenv.assert_called_once()
+        runner_mod._client = None
+
+    def test_uses_shared_http2_transport(self) -> None:
+        import eval_runner.runner as runner_mod
+        runner_mod._client = None
+        with patch("eval_runner.runner.load_dotenv"):
+            with patch("eval_runner.runner.anthropic.DefaultAsyncHttpxClient") as mock_http:
+                with patch("eval_runner.runner.anthropic.AsyncAnthropic") as mock_cls:
+                    get_client()
+        mock_http.assert_called_once_with(http2=True, limits=runner_mod.HTTP_LIMITS)
+        assert mock_cls.call_args.kwargs["http_client"] is mock_http.return_value
+        runner_mod._client = None
+
     def test_caches_client_on_second_call(self) -> None:
         import eval_runner.runner as runner_mod
         runner_mod._client = None
         with patch("eval_runner.runner.load_dotenv"):
-            with patch("eval_runner.runner.anthropic.Anthropic") as mock_cls:
+            with patch("eval_runner.runner.anthropic.AsyncAnthropic") as mock_cls:
                 client1 = get_client()
                 client2 = get_client()
         assert client1 is client2
@@ -66,53 +127,163 @@ class TestGetClient:
 
 
 class TestCallClaude:
-    def test_returns_text_and_latency(self) -> None:
+    async def test_returns_text_and_latency(self) -> None:
         with patch("eval_runner.runner.get_client") as mock_get_client:
-            mock_create = mock_get_client.return_value.messages.create
-            mock_create.return_value = make_anthropic_response("Hello!")
-            text, latency_ms = call_claude("Say hello")
+            mock_create = AsyncMock(return_value=make_anthropic_response("Hello!"))
+            mock_get_client.return_value.messages.create = mock_create
+            text, latency_ms = await call_claude("Say hello")
         assert text == "Hello!"
         assert isinstance(latency_ms, int)
         assert latency_ms >= 0
 
-    def test_includes_system_prompt_when_provided(self) -> None:
+    async def test_includes_system_prompt_when_provided(self) -> None:
+        with patch("eval_runner.runner.get_client") as mock_get_client:
+            mock_create = AsyncMock(return_value=make_anthropic_response("Hi"))
+            mock_get_client.return_value.messages.create = mock_create
+            await call_claude("prompt", system_prompt="Be concise.")
+            call_kwargs = mock_create.call_args.kwargs
+        assert call_kwargs["system"] == [
+            {"type": "text", "text": "Be concise.", "cache_control": {"type": "ephemeral"}}
+        ]
+
+    async def test_marks_string_system_prompt_for_caching(self) -> None:
+        with patch("eval_runner.runner.get_client") as mock_get_client:
+            mock_create = AsyncMock(return_value=make_anthropic_response("Hi"))
+            mock_get_client.return_value.messages.create = mock_create
+            await call_claude("prompt", system_prompt="Be concise.")
+            call_kwargs = mock_create.call_args.kwargs
+        assert call_kwargs["system"][0]["cache_control"] == {"type": "ephemeral"}
+
+    async def test_passes_system_blocks_through(self) -> None:
+        blocks: list[TextBlockParam] = [
+            {"type": "text", "text": "Rubric.", "cache_control": {"type": "ephemeral"}}
+        ]
         with patch("eval_runner.runner.get_client") as mock_get_client:
-            mock_create = mock_get_client.return_value.messages.create
-            mock_create.return_value = make_anthropic_response("Hi")
-            call_claude("prompt", system_prompt="Be concise.")
+            mock_create = AsyncMock(return_value=make_anthropic_response("Hi"))
+            mock_get_client.return_value.messages.create = mock_create
+            await call_claude("prompt", system_prompt=blocks)
             call_kwargs = mock_create.call_args.kwargs
-        assert call_kwargs["system"] == "Be concise."
+        assert call_kwargs["system"] == blocks
 
-    def test_omits_system_prompt_when_empty(self) -> None:
+    async def test_omits_system_prompt_when_empty(self) -> None:
         with patch("eval_runner.runner.get_client") as mock_get_client:
-            mock_create = mock_get_client.return_value.messages.create
-            mock_create.return_value = make_anthropic_response("Hi")
-            call_claude("prompt")
+            mock_create = AsyncMock(return_value=make_anthropic_response("Hi"))
+            mock_get_client.return_value.messages.create = mock_create
+            await call_claude("prompt")
             call_kwargs = mock_create.call_args.kwargs
         assert "system" not in call_kwargs
 
-    def test_raises_on_empty_content(self) -> None:
+    async def test_raises_on_empty_content(self) -> None:
         with patch("eval_runner.runner.get_client") as mock_get_client:
-            mock_get_client.return_value.messages.create.return_value = SimpleNamespace(content=[])
+            mock_get_client.return_value.messages.create = AsyncMock(
+                return_value=SimpleNamespace(content=[])
+            )
             with pytest.raises(ValueError, match="empty content list"):
-                call_claude("prompt")
+                await call_claude("prompt")
 
-    def test_raises_on_non_text_block(self) -> None:
+    async def test_raises_on_non_text_block(self) -> None:
         with patch("eval_runner.runner.get_client") as mock_get_client:
-            mock_get_client.return_value.messages.create.return_value = SimpleNamespace(
-                content=[SimpleNamespace(type="tool_use")]
+            mock_get_client.return_value.messages.create = AsyncMock(
+                return_value=SimpleNamespace(content=[SimpleNamespace(type="tool_use")])
             )
             with pytest.raises(ValueError, match="Unexpected content block type"):
-                call_claude("prompt")
+                await call_claude("prompt")
 
-    def test_accepts_custom_max_tokens(self) -> None:
+    async def test_accepts_custom_max_tokens(self) -> None:
         with patch("eval_runner.runner.get_client") as mock_get_client:
-            mock_create = mock_get_client.return_value.messages.create
-            mock_create.return_value = make_anthropic_response("Hi")
-            call_claude("prompt", max_tokens=2048)
+            mock_create = AsyncMock(return_value=make_anthropic_response("Hi"))
+            mock_get_client.return_value.messages.create = mock_create
+            await call_claude("prompt", max_tokens=2048)
             call_kwargs = mock_create.call_args.kwargs
         assert call_kwargs["max_tokens"] == 2048
 
+    async def test_returns_cached_response_without_api_call(self) -> None:
+        with patch("eval_runner.runner.get_client") as mock_get_client:
+            mock_create = AsyncMock(return_value=make_anthropic_response("Hi"))
+            mock_get_client.return_value.messages.create = mock_create
+            await call_claude("prompt", system_prompt="Be concise.")
+            mock_create.reset_mock()
+            text, latency_ms = await call_claude("prompt", system_prompt="Be concise.")
+        assert mock_create.call_count == 0
+        assert text == "Hi"
+        assert latency_ms == 0
+
+    async def test_bypasses_cache_when_disabled(self, isolated_llm_cache: Path) -> None:
+        with patch("eval_runner.runner.get_client") as mock_get_client, \
+                patch("eval_runner.llm_cache.make_key") as mock_make_key:
+            mock_create = AsyncMock(return_value=make_anthropic_response("Hi"))
+            mock_get_client.return_value.messages.create = mock_create
+            await call_claude("prompt", use_cache=False)
+            await call_claude("prompt", use_cache=False)
+        assert mock_create.call_count == 2
+        mock_make_key.assert_not_called()
+        assert not isolated_llm_cache.exists()
+
+
+class TestGatherBounded:
+    async def test_preserves_order_and_captures_exceptions(self) -> None:
+        async def work(i: int) -> int:
+            await asyncio.sleep(0.01 * (3 - i))
+            if i == 1:
+                raise ValueError("boom")
+            return i
+
+        outcomes = await gather_bounded((work(i) for i in range(3)), limit=3)
+        assert outcomes[0] == 0
+        assert isinstance(outcomes[1], ValueError)
+        assert outcomes[2] == 2
+
+    async def test_limits_in_flight_awaitables(self) -> None:
+        in_flight = 0
+        peak = 0
+
+        async def work() -> None:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        await gather_bounded((work() for _ in range(10)), limit=3)
+        assert peak == 3
+
+    async def test_rejects_limit_below_one(self) -> None:
+        with pytest.raises(ValueError, match="at least 1"):
+            await gather_bounded([], limit=0)
+
+
+class TestGatherBoundedFailFast:
+    async def test_preserves_order(self) -> None:
+        async def work(i: int) -> int:
+            await asyncio.sleep(0.01 * (3 - i))
+            return i
+
+        assert await gather_bounded_fail_fast((work(i) for i in range(3)), limit=2) == [0, 1, 2]
+
+    async def test_first_error_cancels_the_rest(self) -> None:
+        started: list[int] = []
+        cancelled: list[int] = []
+
+        async def work(i: int) -> int:
+            started.append(i)
+            if i == 0:
+                raise ValueError("boom")
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(i)
+                raise
+            return i
+
+        with pytest.raises(ValueError, match="boom"):
+            await gather_bounded_fail_fast((work(i) for i in range(10)), limit=2)
+        assert started == [0, 1]
+        assert cancelled == [1]
+
+    async def test_rejects_limit_below_one(self) -> None:
+        with pytest.raises(ValueError, match="at least 1"):
+            await gather_bounded_fail_fast([], limit=0)
+
 
 class TestLoadTestCases:
     def test_loads_test_cases_from_json(self, tmp_path: Path) -> None:
@@ -154,6 +325,14 @@ class TestLoadTestCases:
         with pytest.raises(ValidationError):
             load_test_cases(path, uuid4())
 
+    def test_validation_error_locates_bad_row(self, tmp_path: Path) -> None:
+        data = [{"input": "x", "expected_output": "y"}, {"input": "x"}]
+        path = tmp_path / "cases.json"
+        path.write_text(json.dumps(data))
+        with pytest.raises(ValidationError) as exc_info:
+            load_test_cases(path, uuid4())
+        assert exc_info.value.errors()[0]["loc"] == (1, "expected_output")
+
     def test_raises_on_extra_fields(self, tmp_path: Path) -> None:
         data = [{"input": "x", "expected_output": "y", "unknown_field": "z"}]
         path = tmp_path / "cases.json"
@@ -163,7 +342,7 @@ class TestLoadTestCases:
 
 
 class TestRunTestCase:
-    def test_exact_match_scoring(self) -> None:
+    async def test_exact_match_scoring(self, mock_claude: AsyncMock) -> None:
         run = make_run()
         tc = TestCase(
             project_id=run.project_id,
@@ -171,12 +350,12 @@ class TestRunTestCase:
             expected_output="4",
             scoring_method=ScoringMethod.exact_match,
         )
-        with patch("eval_runner.runner.call_claude", return_value=("4", 100)):
-            result = run_test_case(tc, run)
+        mock_claude.return_value = ("4", 100)
+        result = await run_test_case(tc, run)
         assert result.score == 1.0
         assert result.latency_ms == 100
 
-    def test_llm_judge_scoring(self) -> None:
+    async def test_llm_judge_scoring(self, mock_claude: AsyncMock) -> None:
         run = make_run()
         tc = TestCase(
             project_id=run.project_id,
@@ -184,14 +363,54 @@ class TestRunTestCase:
             expected_output="A REST API uses HTTP.",
             scoring_method=ScoringMethod.llm_judge,
         )
-        with patch("eval_runner.runner.call_claude", side_effect=[
+        mock_claude.side_effect = [
             ("A REST API uses HTTP methods.", 100),
             ("<reasoning>Correct.</reasoning>\n<score>0.9</score>", 50),
-        ]):
-            result = run_test_case(tc, run)
+        ]
+        result = await run_test_case(tc, run)
         assert result.score == 0.9
 
-    def test_raises_for_unimplemented_scoring_method(self) -> None:
+    async def test_judge_is_called_again_when_cache_disabled(
+        self, mock_claude: AsyncMock
+    ) -> None:
+        run = make_run()
+        tc = TestCase(
+            project_id=run.project_id,
+            input="Explain REST.",
+            expected_output="A REST API uses HTTP.",
+            scoring_method=ScoringMethod.llm_judge,
+        )
+        mock_claude.side_effect = [
+            ("A REST API uses HTTP methods.", 100),
+            ("<reasoning>Good.</reasoning>\n<score>0.9</score>", 50),
+            ("A REST API uses HTTP methods.", 100),
+            ("<reasoning>Poor.</reasoning>\n<score>0.1</score>", 50),
+        ]
+        first = await run_test_case(tc, run, cache_judge=False)
+        second = await run_test_case(tc, run, cache_judge=False)
+        assert (first.score, second.score) == (0.9, 0.1)
+
+    async def test_judge_cache_applies_without_response_cache(
+        self, mock_claude: AsyncMock
+    ) -> None:
+        run = make_run()
+        tc = TestCase(
+            project_id=run.project_id,
+            input="Explain REST.",
+            expected_output="A REST API uses HTTP.",
+            scoring_method=ScoringMethod.llm_judge,
+        )
+        mock_claude.side_effect = [
+            ("A REST API uses HTTP methods.", 100),
+            ("<reasoning>Good.</reasoning>\n<score>0.9</score>", 50),
+            ("A REST API uses HTTP methods.", 100),
+        ]
+        first = await run_test_case(tc, run, use_cache=False)
+        second = await run_test_case(tc, run, use_cache=False)
+        assert (first.score, second.score) == (0.9, 0.9)
+        assert mock_claude.call_count == 3
+
+    async def test_raises_for_unimplemented_scoring_method(self, mock_claude: AsyncMock) -> None:
         run = make_run()
         tc = TestCase(
             project_id=run.project_id,
@@ -199,49 +418,45 @@ class TestRunTestCase:
             expected_output="y",
             scoring_method=ScoringMethod.fuzzy,
         )
-        with patch("eval_runner.runner.call_claude", return_value=("x", 100)):
-            with pytest.raises((NotImplementedError, ValueError)):
-                run_test_case(tc, run)
+        mock_claude.return_value = ("x", 100)
+        with pytest.raises((NotImplementedError, ValueError)):
+            await run_test_case(tc, run)
 
 
 class TestPrintSummary:
-    def test_shows_pass_for_high_score(self, capsys: pytest.CaptureFixture[str]) -> None:
-        run = make_run()
-        tc = TestCase(project_id=run.project_id, input="Question?", expected_output="Answer")
-        result = make_result(test_case_id=tc.id, score=1.0)
-        print_summary([result], [tc])
+    def test_shows_pass_for_high_score(
+        self, shared_tc: TestCase, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        print_summary([make_result(test_case_id=shared_tc.id, score=1.0)], [shared_tc])
         assert "PASS" in capsys.readouterr().out
 
-    def test_shows_fail_for_low_score(self, capsys: pytest.CaptureFixture[str]) -> None:
-        run = make_run()
-        tc = TestCase(project_id=run.project_id, input="Question?", expected_output="Answer")
-        result = make_result(test_case_id=tc.id, score=0.5)
-        print_summary([result], [tc])
+    def test_shows_fail_for_low_score(
+        self, shared_tc: TestCase, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        print_summary([make_result(test_case_id=shared_tc.id, score=0.5)], [shared_tc])
         assert "FAIL" in capsys.readouterr().out
 
-    def test_shows_correct_pass_count(self, capsys: pytest.CaptureFixture[str]) -> None:
-        run = make_run()
-        tc1 = TestCase(project_id=run.project_id, input="Q1?", expected_output="A1")
-        tc2 = TestCase(project_id=run.project_id, input="Q2?", expected_output="A2")
+    def test_shows_correct_pass_count(
+        self, shared_run: Run, shared_tc: TestCase, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        tc2 = TestCase(project_id=shared_run.project_id, input="Q2?", expected_output="A2")
         results = [
-            make_result(test_case_id=tc1.id, score=1.0),
+            make_result(test_case_id=shared_tc.id, score=1.0),
             make_result(test_case_id=tc2.id, score=0.5),
         ]
-        print_summary(results, [tc1, tc2])
+        print_summary(results, [shared_tc, tc2])
         assert "1/2" in capsys.readouterr().out
 
-    def test_passes_at_threshold(self, capsys: pytest.CaptureFixture[str]) -> None:
-        run = make_run()
-        tc = TestCase(project_id=run.project_id, input="Question?", expected_output="Answer")
-        result = make_result(test_case_id=tc.id, score=0.7)
-        print_summary([result], [tc])
+    def test_passes_at_threshold(
+        self, shared_tc: TestCase, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        print_summary([make_result(test_case_id=shared_tc.id, score=0.7)], [shared_tc])
         assert "PASS" in capsys.readouterr().out
 
-    def test_fails_just_below_threshold(self, capsys: pytest.CaptureFixture[str]) -> None:
-        run = make_run()
-        tc = TestCase(project_id=run.project_id, input="Question?", expected_output="Answer")
-        result = make_result(test_case_id=tc.id, score=0.69)
-        print_summary([result], [tc])
+    def test_fails_just_below_threshold(
+        self, shared_tc: TestCase, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        print_summary([make_result(test_case_id=shared_tc.id, score=0.69)], [shared_tc])
         assert "FAIL" in capsys.readouterr().out
 
     def test_shows_unknown_for_missing_test_case(self, capsys: pytest.CaptureFixture[str]) -> None:
@@ -249,54 +464,90 @@ class TestPrintSummary:
         print_summary([result], [])
         assert "unknown" in capsys.readouterr().out
 
+    def test_pairs_results_by_id_not_position(
+        self, shared_run: Run, shared_tc: TestCase, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        tc2 = TestCase(project_id=shared_run.project_id, input="Second?", expected_output="A2")
+        results = [make_result(test_case_id=tc2.id, score=0.0, reasoning="Wrong.")]
+        print_summary(results, [shared_tc, tc2])
+        out = capsys.readouterr().out
+        assert "Second?" in out
+        assert shared_tc.input not in out
+
 
 class TestSaveResults:
-    def test_creates_json_file(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_creates_json_file(
+        self, shared_run: Run, shared_result: Result, tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
         monkeypatch.setattr("eval_runner.runner.RESULTS_DIR", tmp_path)
-        run = make_run()
-        result = make_result(run_id=run.id)
-        save_results([result], run)
+        save_results([shared_result], shared_run)
         files = list(tmp_path.iterdir())
         assert len(files) == 1
         assert files[0].suffix == ".json"
 
+    def test_filename_is_keyed_by_run_id(
+        self, shared_run: Run, shared_result: Result, tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr("eval_runner.runner.RESULTS_DIR", tmp_path)
+        save_results([shared_result], shared_run)
+        assert list(tmp_path.iterdir())[0].stem == f"{shared_run.name}_{shared_run.id}"
+
     def test_file_contains_run_and_results(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, shared_run: Run, shared_result: Result, tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         monkeypatch.setattr("eval_runner.runner.RESULTS_DIR", tmp_path)
-        run = make_run(name="my-run")
-        result = make_result(run_id=run.id)
-        save_results([result], run)
+        save_results([shared_result], shared_run)
         data = json.loads(list(tmp_path.iterdir())[0].read_text())
-        assert data["run"]["name"] == "my-run"
+        assert data["run"]["name"] == shared_run.name
         assert len(data["results"]) == 1
 
+    def test_file_encodes_model_fields(
+        self, shared_run: Run, shared_result: Result, tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr("eval_runner.runner.RESULTS_DIR", tmp_path)
+        save_results([shared_result], shared_run)
+        raw = list(tmp_path.iterdir())[0].read_text()
+        data = json.loads(raw)
+        assert raw.endswith("}\n")
+        assert data["results"][0]["run_id"] == str(shared_run.id)
+        assert data["run"]["created_at"].endswith("Z")
+
 
 class TestRunEval:
-    def test_returns_results(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    async def test_returns_results(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mock_claude: AsyncMock
+    ) -> None:
         monkeypatch.setattr("eval_runner.runner.RESULTS_DIR", tmp_path / "results")
         cases = [{"input": "What is 2+2?", "expected_output": "4", "scoring_method": "exact_match"}]
         cases_path = tmp_path / "cases.json"
         cases_path.write_text(json.dumps(cases))
-        with patch("eval_runner.runner.call_claude", return_value=("4", 100)):
-            results = run_eval(test_cases_path=cases_path, run_name="test-run")
+        mock_claude.return_value = ("4", 100)
+        results = await run_eval(test_cases_path=cases_path, run_name="test-run")
         assert len(results) == 1
         assert results[0].score == 1.0
 
-    def test_saves_result_file(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    async def test_saves_result_file(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mock_claude: AsyncMock
+    ) -> None:
         monkeypatch.setattr("eval_runner.runner.RESULTS_DIR", tmp_path / "results")
         cases = [{"input": "What is 2+2?", "expected_output": "4", "scoring_method": "exact_match"}]
         cases_path = tmp_path / "cases.json"
         cases_path.write_text(json.dumps(cases))
-        with patch("eval_runner.runner.call_claude", return_value=("4", 100)):
-            run_eval(test_cases_path=cases_path, run_name="test-run")
+        mock_claude.return_value = ("4", 100)
+        await run_eval(test_cases_path=cases_path, run_name="test-run")
         result_files = list((tmp_path / "results").iterdir())
         assert len(result_files) == 1
         data = json.loads(result_files[0].read_text())
         assert data["run"]["name"] == "test-run"
         assert len(data["results"]) == 1
 
-    def test_continues_after_error(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    async def test_continues_after_error(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mock_claude: AsyncMock
+    ) -> None:
         monkeypatch.setattr("eval_runner.runner.RESULTS_DIR", tmp_path / "results")
         cases = [
             {"input": "Q1?", "expected_output": "A1", "scoring_method": "exact_match"},
@@ -305,21 +556,94 @@ class TestRunEval:
         cases_path = tmp_path / "cases.json"
         cases_path.write_text(json.dumps(cases))
         side_effects = [Exception("API error"), ("A2", 100)]
-        with patch("eval_runner.runner.call_claude", side_effect=side_effects):
-            results = run_eval(test_cases_path=cases_path, run_name="test-run")
+        mock_claude.side_effect = side_effects
+        results = await run_eval(test_cases_path=cases_path, run_name="test-run")
         assert len(results) == 1
         assert results[0].actual_output == "A2"
         data = json.loads(list((tmp_path / "results").iterdir())[0].read_text())
         assert data["run"]["status"] == RunStatus.failed
 
-    def test_run_status_is_failed_when_errors_occur(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    async def test_run_status_is_failed_when_errors_occur(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mock_claude: AsyncMock
     ) -> None:
         monkeypatch.setattr("eval_runner.runner.RESULTS_DIR", tmp_path / "results")
         cases = [{"input": "Q?", "expected_output": "A", "scoring_method": "exact_match"}]
         cases_path = tmp_path / "cases.json"
         cases_path.write_text(json.dumps(cases))
-        with patch("eval_runner.runner.call_claude", side_effect=Exception("API error")):
-            run_eval(test_cases_path=cases_path, run_name="test-run")
+        mock_claude.side_effect = Exception("API error")
+        await run_eval(test_cases_path=cases_path, run_name="test-run")
         data = json.loads(list((tmp_path / "results").iterdir())[0].read_text())
         assert data["run"]["status"] == RunStatus.failed
+
+    async def test_max_concurrency_bounds_in_flight_calls(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mock_claude: AsyncMock
+    ) -> None:
+        monkeypatch.setattr("eval_runner.runner.RESULTS_DIR", tmp_path / "results")
+        cases = [
+            {"input": f"Q{i}?", "expected_output": "A", "scoring_method": "exact_match"}
+            for i in range(6)
+        ]
+        cases_path = tmp_path / "cases.json"
+        cases_path.write_text(json.dumps(cases))
+        in_flight = 0
+        peak = 0
+
+        async def fake_call_claude(
+            prompt: str, system_prompt: str = "", use_cache: bool = True
+        ) -> tuple[str, int]:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return "A", 10
+
+        mock_claude.side_effect = fake_call_claude
+        results = await run_eval(
+            test_cases_path=cases_path, run_name="test-run", max_concurrency=2
+        )
+        assert len(results) == 6
+        assert peak == 2
+
+    async def test_rejects_max_concurrency_below_one(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mock_claude: AsyncMock
+    ) -> None:
+        monkeypatch.setattr("eval_runner.runner.RESULTS_DIR", tmp_path / "results")
+        cases_path = tmp_path / "cases.json"
+        cases_path.write_text(json.dumps([{"input": "Q?", "expected_output": "A"}]))
+        with pytest.raises(ValueError, match="at least 1"):
+            await run_eval(test_cases_path=cases_path, run_name="test-run", max_concurrency=0)
+        mock_claude.assert_not_called()
+
+    async def test_skips_summary_when_stdout_summary_disabled(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mock_claude: AsyncMock,
+        mocker: MockerFixture,
+    ) -> None:
+        monkeypatch.setattr("eval_runner.runner.RESULTS_DIR", tmp_path / "results")
+        monkeypatch.setattr("eval_runner.runner.STDOUT_SUMMARY", False)
+        cases = [{"input": "Q?", "expected_output": "A", "scoring_method": "exact_match"}]
+        cases_path = tmp_path / "cases.json"
+        cases_path.write_text(json.dumps(cases))
+        mock_claude.return_value = ("A", 100)
+        mock_summary = mocker.patch("eval_runner.runner.print_summary")
+        await run_eval(test_cases_path=cases_path, run_name="test-run")
+        mock_summary.assert_not_called()
+        assert len(list((tmp_path / "results").iterdir())) == 1
+
+    async def test_run_eval_cases_accepts_in_memory_cases(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mock_claude: AsyncMock
+    ) -> None:
+        monkeypatch.setattr("eval_runner.runner.RESULTS_DIR", tmp_path / "results")
+        project_id = uuid4()
+        cases = [
+            TestCase(
+                project_id=project_id, input="What is 2+2?", expected_output="4",
+                scoring_method=ScoringMethod.exact_match,
+            )
+        ]
+        mock_claude.return_value = ("4", 100)
+        results = await run_eval_cases(cases, run_name="test-run")
+        assert len(results) == 1
+        assert results[0].test_case_id == cases[0].id
+        data = json.loads(list((tmp_path / "results").iterdir())[0].read_text())
+        assert data["run"]["project_id"] == str(project_id)